@@ -0,0 +1,43 @@
+"""add_event_team_trigram_indexes
+
+Revision ID: 3c7e1f0a9b42
+Revises: fd89bb957b2a
+Create Date: 2026-10-16 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e1f0a9b42'
+down_revision: Union[str, Sequence[str], None] = 'fd89bb957b2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram indexes back the fuzzy team prefilter in DataIngester._find_existing_event.
+    # PostgreSQL only; SQLite (development) keeps the plain league/time window scan.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_event_home_team_trgm', 'event', ['home_team'],
+        postgresql_using='gin', postgresql_ops={'home_team': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_event_away_team_trgm', 'event', ['away_team'],
+        postgresql_using='gin', postgresql_ops={'away_team': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index('ix_event_away_team_trgm', table_name='event')
+    op.drop_index('ix_event_home_team_trgm', table_name='event')
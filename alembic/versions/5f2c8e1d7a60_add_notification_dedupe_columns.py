@@ -0,0 +1,60 @@
+"""add_notification_dedupe_columns
+
+Revision ID: 5f2c8e1d7a60
+Revises: 9d4b2a6e81c3
+Create Date: 2026-10-16 10:47:53.216904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c8e1d7a60'
+down_revision: Union[str, Sequence[str], None] = '9d4b2a6e81c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notification', sa.Column('preset_id', sa.Integer(), nullable=True))
+    op.add_column('notification', sa.Column('odd_id', sa.Integer(), nullable=True))
+
+    # Backfill from the JSON dedupe key of existing trade alerts
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "UPDATE notification SET "
+            "preset_id = (data->>'preset_id')::integer, "
+            "odd_id = (data->>'odd_id')::integer "
+            "WHERE type = 'trade_alert'"
+        )
+    else:
+        op.execute(
+            "UPDATE notification SET "
+            "preset_id = json_extract(data, '$.preset_id'), "
+            "odd_id = json_extract(data, '$.odd_id') "
+            "WHERE type = 'trade_alert'"
+        )
+
+    # Drop duplicate trade alerts (keep the first) so the unique index can be built
+    op.execute(
+        "DELETE FROM notification WHERE type = 'trade_alert' AND id NOT IN ("
+        "SELECT MIN(id) FROM notification WHERE type = 'trade_alert' GROUP BY preset_id, odd_id"
+        ")"
+    )
+    op.create_index(
+        'ux_notification_trade_dedupe', 'notification', ['type', 'preset_id', 'odd_id'],
+        unique=True,
+        postgresql_where=sa.text("type = 'trade_alert'"),
+        sqlite_where=sa.text("type = 'trade_alert'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_notification_trade_dedupe', table_name='notification')
+    op.drop_column('notification', 'odd_id')
+    op.drop_column('notification', 'preset_id')
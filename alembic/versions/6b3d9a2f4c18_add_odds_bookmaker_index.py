@@ -0,0 +1,28 @@
+"""add_odds_bookmaker_index
+
+Revision ID: 6b3d9a2f4c18
+Revises: 5f2c8e1d7a60
+Create Date: 2026-10-16 11:24:09.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b3d9a2f4c18'
+down_revision: Union[str, Sequence[str], None] = '5f2c8e1d7a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_odds_bookmaker_id', 'odds', ['bookmaker_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_odds_bookmaker_id', table_name='odds')
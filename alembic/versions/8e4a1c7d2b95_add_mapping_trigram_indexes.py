@@ -0,0 +1,44 @@
+"""add_mapping_trigram_indexes
+
+Revision ID: 8e4a1c7d2b95
+Revises: 6b3d9a2f4c18
+Create Date: 2026-10-16 12:05:33.184902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4a1c7d2b95'
+down_revision: Union[str, Sequence[str], None] = '6b3d9a2f4c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns matched by the mappings page search (ILIKE '%term%' on each, OR-ed together)
+MAPPING_SEARCH_COLUMNS = ('external_name', 'external_key', 'internal_key')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram indexes let PostgreSQL answer the '%term%' ILIKE search with a bitmap
+    # index scan instead of a sequential scan. All three columns are needed for the OR.
+    # PostgreSQL only; SQLite (development) keeps the plain scan.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in MAPPING_SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_mapping_{column}_trgm', 'mapping', [column],
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for column in reversed(MAPPING_SEARCH_COLUMNS):
+        op.drop_index(f'ix_mapping_{column}_trgm', table_name='mapping')
@@ -0,0 +1,42 @@
+"""add_odds_and_event_lookup_indexes
+
+Revision ID: 9d4b2a6e81c3
+Revises: 3c7e1f0a9b42
+Create Date: 2026-10-16 10:02:17.884129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b2a6e81c3'
+down_revision: Union[str, Sequence[str], None] = '3c7e1f0a9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Remove duplicate odds rows (keep the newest) so the unique index can be built.
+    # GROUP BY treats NULL points as equal on both PostgreSQL and SQLite.
+    op.execute(
+        "DELETE FROM odds WHERE id NOT IN ("
+        "SELECT MAX(id) FROM odds GROUP BY market_id, bookmaker_id, selection, point"
+        ")"
+    )
+    op.create_index(
+        'ux_odds_market_bookmaker_selection_point', 'odds',
+        ['market_id', 'bookmaker_id', 'selection', 'point'],
+        unique=True,
+        postgresql_nulls_not_distinct=True
+    )
+    op.create_index('ix_event_league_commence', 'event', ['league_key', 'commence_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_league_commence', table_name='event')
+    op.drop_index('ux_odds_market_bookmaker_selection_point', table_name='odds')
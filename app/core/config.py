@@ -31,6 +31,7 @@ class Settings(BaseSettings):
 
     # Scheduler
     PRESET_SYNC_INTERVAL_HOURS: int = 6
+    SCHEDULER_DB_POOL_SIZE: int = 4 # Connections reserved for scheduler jobs (PostgreSQL)
     
     # Server
     PORT: int = 8123
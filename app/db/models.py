@@ -40,6 +40,10 @@ class Event(Base, TimestampMixin):
     markets: Mapped[List["Market"]] = relationship(back_populates="event", cascade="all, delete-orphan")
     bets: Mapped[List["Bet"]] = relationship(back_populates="event")
 
+    __table_args__ = (
+        Index('ix_event_league_commence', 'league_key', 'commence_time'),
+    )
+
 class Bookmaker(Base, TimestampMixin):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     key: Mapped[str] = mapped_column(String, unique=True, index=True) # e.g., 'pinnacle', 'smarkets'
@@ -97,6 +101,19 @@ class Odds(Base, TimestampMixin):
     market: Mapped["Market"] = relationship(back_populates="odds")
     bookmaker: Mapped["Bookmaker"] = relationship(back_populates="odds_entries")
 
+    __table_args__ = (
+        # One row per bookmaker line; also serves (market_id, bookmaker_id) lookups.
+        # NULL points (h2h) must collide too, hence NULLS NOT DISTINCT (PostgreSQL 15+).
+        Index(
+            'ux_odds_market_bookmaker_selection_point',
+            'market_id', 'bookmaker_id', 'selection', 'point',
+            unique=True,
+            postgresql_nulls_not_distinct=True
+        ),
+        # Per-bookmaker filters, newest rows first
+        Index('ix_odds_bookmaker_id', 'bookmaker_id', 'id'),
+    )
+
 class Bet(Base, TimestampMixin):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     event_id: Mapped[str] = mapped_column(ForeignKey("event.id"))
@@ -192,6 +209,19 @@ class Notification(Base, TimestampMixin):
     sent: Mapped[bool] = mapped_column(Boolean, default=False)
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # Trade alert dedupe key (preset_id, odd_id); not FKs, test alerts use a mock preset
+    preset_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    odd_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index(
+            'ux_notification_trade_dedupe', 'type', 'preset_id', 'odd_id',
+            unique=True,
+            postgresql_where=text("type = 'trade_alert'"),
+            sqlite_where=text("type = 'trade_alert'")
+        ),
+    )
+
 class Mapping(Base, TimestampMixin):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     source: Mapped[str] = mapped_column(String) # e.g., 'smarkets'
@@ -5,6 +5,23 @@ from app.core.config import settings
 engine = create_async_engine(settings.DATABASE_URL, echo=False)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+# Scheduler jobs get their own small pool on PostgreSQL, so cron fan-out
+# cannot exhaust the connections serving API requests.
+# SQLite keeps a single engine (a second one would only add lock contention).
+if engine.dialect.name == "postgresql":
+    scheduler_engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        pool_size=settings.SCHEDULER_DB_POOL_SIZE,
+        max_overflow=0,
+        pool_pre_ping=True,
+        # JIT compilation slows down the short OLTP queries the jobs run
+        connect_args={"server_settings": {"jit": "off"}}
+    )
+else:
+    scheduler_engine = engine
+SchedulerSessionLocal = async_sessionmaker(scheduler_engine, expire_on_commit=False)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
@@ -13,7 +13,7 @@ from app.core.security import AppStartupFailedException, AppStartupLoadingExcept
 from app.services.notifications.telegram import TelegramNotifier
 from app.services.scheduler import start_scheduler, stop_scheduler
 from starlette.middleware.sessions import SessionMiddleware
-from app.services.bookmakers.base import BookmakerFactory
+from app.services.bookmakers.base import BookmakerFactory, APIBookmaker
 
 # Configure Logging
 logging.basicConfig(
@@ -31,7 +31,7 @@ from app.services.analysis import OddsAnalysisService
 from app.db.models import Sport, Bookmaker
 from sqlalchemy import select
 from app.api.deps import get_db
-from app.db.session import engine, AsyncSessionLocal
+from app.db.session import engine, scheduler_engine, AsyncSessionLocal
 from app.services.scheduler import job_preset_sync
 
 async def check_and_sync_initial_data():
@@ -101,6 +101,19 @@ async def check_and_sync_initial_data():
         # Changed this to run from scheduler next_run_time
         break
 
+async def wait_for_migrations(timeout: float = 300.0):
+    """When launched by the tray app, wait until its migration run removes the marker file."""
+    marker = os.environ.get("MIGRATIONS_PENDING_FILE")
+    if not marker:
+        return
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while os.path.exists(marker):
+        if loop.time() > deadline:
+            logger.warning(f"Migrations still pending after {timeout:.0f}s, continuing startup.")
+            return
+        await asyncio.sleep(0.2)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
@@ -120,6 +133,7 @@ async def lifespan(app: FastAPI):
                 # We don't raise here immediately because we want to allow the app to actually boot 
                 # so it can serve the error page. But we skip the sync logic.
             else:
+                await wait_for_migrations()
                 await check_and_sync_initial_data()
                 start_scheduler(run_immediately=True)
                 app.state.startup_status = "ready"
@@ -146,9 +160,26 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping connection manager: {e}")
     
+    try:
+        await TelegramNotifier.aclose()
+    except Exception as e:
+        logger.error(f"Error closing Telegram client: {e}")
+
+    try:
+        await TheOddsAPIClient.aclose()
+    except Exception as e:
+        logger.error(f"Error closing TheOddsAPI client: {e}")
+
+    try:
+        await APIBookmaker.aclose()
+    except Exception as e:
+        logger.error(f"Error closing bookmaker HTTP clients: {e}")
+
     # Close database engine pool
     logger.info("Disposing database engine...")
     await engine.dispose()
+    if scheduler_engine is not engine:
+        await scheduler_engine.dispose()
     
     logger.info("Shutting down complete.")
 
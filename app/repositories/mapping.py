@@ -1,10 +1,17 @@
 
-from typing import Optional
-from sqlalchemy import select
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import select, tuple_, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.base import BaseRepository
 from app.db.models import Mapping
 
+# Single-key lookup, built once (served by the unique ix_mapping_source_type_external index)
+_INTERNAL_KEY_STMT = select(Mapping.internal_key).where(
+    Mapping.source == bindparam("source"),
+    Mapping.type == bindparam("type"),
+    Mapping.external_key == bindparam("external_key")
+)
+
 class MappingRepository(BaseRepository[Mapping]):
     def __init__(self):
         super().__init__(Mapping)
@@ -12,13 +19,43 @@ class MappingRepository(BaseRepository[Mapping]):
     async def get_internal_key(
         self, db: AsyncSession, source: str, type: str, external_key: str
     ) -> Optional[str]:
-        query = select(self.model.internal_key).where(
+        result = await db.execute(
+            _INTERNAL_KEY_STMT, {"source": source, "type": type, "external_key": external_key}
+        )
+        return result.scalar_one_or_none()
+
+    async def get_internal_keys(
+        self, db: AsyncSession, source: str, type: str, external_keys: Iterable[str]
+    ) -> Dict[str, str]:
+        """Returns {external_key: internal_key} for the given keys in one query."""
+        external_keys = list(external_keys)
+        if not external_keys:
+            return {}
+        query = select(self.model.external_key, self.model.internal_key).where(
             self.model.source == source,
             self.model.type == type,
-            self.model.external_key == external_key
+            self.model.external_key.in_(external_keys)
         )
         result = await db.execute(query)
-        return result.scalar_one_or_none()
+        return dict(result.all())
+
+    async def get_internal_keys_bulk(
+        self, db: AsyncSession, triples: Iterable[Tuple[str, str, str]]
+    ) -> Dict[Tuple[str, str, str], str]:
+        """
+        Returns {(source, type, external_key): internal_key} for keys spanning any
+        number of sources and types, in one query.
+        """
+        triples = list(set(triples))
+        if not triples:
+            return {}
+        query = select(
+            self.model.source, self.model.type, self.model.external_key, self.model.internal_key
+        ).where(
+            tuple_(self.model.source, self.model.type, self.model.external_key).in_(triples)
+        )
+        result = await db.execute(query)
+        return {(source, type_, external_key): internal_key for source, type_, external_key, internal_key in result.all()}
 
     async def get_by_source_and_type(
         self, db: AsyncSession, source: str, type: str
@@ -138,8 +138,6 @@ async def place_bet(
             
             if response.executed_price:
                 update_data["price"] = response.executed_price
-                
-            db.add(bookmaker_model)
             
             # Send Notification if preset_id is present
             if bet_obj.preset_id:
@@ -19,7 +19,6 @@ async def toggle_popular_league(
         raise HTTPException(status_code=404, detail="League not found")
     
     league.popular = not league.popular
-    db.add(league)
     await db.commit()
     await db.refresh(league)
     
@@ -600,7 +600,6 @@ async def register_manual_bet(
                     new_bet.price = place_res.executed_price
                 
                 bm.balance -= actual_stake
-                db.add(bm)
                 await db.commit()
             else:
                 new_bet.status = "error"
@@ -615,7 +614,6 @@ async def register_manual_bet(
     else:
         # Manual logging just deducts balance
         bm.balance -= bet_in.stake
-        db.add(bm)
         await db.commit()
     
     # Send Notification if preset attached
@@ -84,7 +84,6 @@ class OddsAnalysisService:
                         o.margin = margin
                         o.implied_probability = fair_prob
                         o.true_odds = 1.0 / fair_prob
-                        db.add(o)
 
                     # 7. Apply to other bookmakers
                     for bk_id, bk_odds in odds_by_bk.items():
@@ -107,7 +106,6 @@ class OddsAnalysisService:
                                 if not o.implied_probability:
                                     o.implied_probability = calculate_implied_probability(o.price)
                                 o.margin = bk_margin
-                            db.add(o)
                 else:
                     # No Pinnacle odds for this market - calculate implied probability for all bookmakers
                     for bk_id, bk_odds in odds_by_bk.items():
@@ -120,7 +118,6 @@ class OddsAnalysisService:
                             if not o.implied_probability:
                                 o.implied_probability = calculate_implied_probability(o.price)
                             o.margin = bk_margin
-                            db.add(o)
 
         await db.commit()
         logger.info("Odds Analysis completed.")
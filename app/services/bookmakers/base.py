@@ -4,6 +4,7 @@ import asyncio
 import time
 import difflib
 import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 from sqlalchemy import select
@@ -13,6 +14,13 @@ from app.db.models import Bet, Mapping, League
 from app.schemas.odds import OddsEvent, OddsSport
 from app.domain.schemas import BetSlip
 
+try:
+    # Optional HTTP/2 support for httpx (pip install "betfinder[speedups]")
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 # --- Fuzzy Matching Helpers ---
 
 COUNTRY_SYNONYMS = {
@@ -29,19 +37,24 @@ COUNTRY_SYNONYMS = {
     "american": "usa",
 }
 
+_TOKEN_SPLIT_RE = re.compile(r'[^a-zA-Z0-9]+')
+
 def tokenize(s: str) -> List[str]:
-    return [t for t in re.split(r'[^a-zA-Z0-9]+', s.lower()) if t]
+    return [t for t in _TOKEN_SPLIT_RE.split(s.lower()) if t]
 
+@lru_cache(maxsize=4096)
 def normalize_title(s: str) -> str:
-    tokens = tokenize(s)
-    normalized = []
-    for t in tokens:
-        normalized.append(COUNTRY_SYNONYMS.get(t, t))
-    return " ".join(normalized)
+    # League titles repeat on every sync, so results are memoized
+    return " ".join([COUNTRY_SYNONYMS.get(t, t) for t in _TOKEN_SPLIT_RE.split(s.lower()) if t])
+
+def _ratio(s1: str, s2: str) -> float:
+    """Similarity of two strings in 0.0-1.0 (difflib Ratcliff/Obershelp, which the thresholds are tuned for)."""
+    return difflib.SequenceMatcher(None, s1, s2).ratio()
 
 def simple_ratio(s1: str, s2: str) -> float:
-    return difflib.SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
+    return _ratio(s1.lower(), s2.lower())
 
+@lru_cache(maxsize=4096)
 def token_sort_ratio(s1: str, s2: str) -> float:
     s1 = normalize_title(s1)
     s2 = normalize_title(s2)
@@ -49,7 +62,7 @@ def token_sort_ratio(s1: str, s2: str) -> float:
     t2 = tokenize(s2)
     t1.sort()
     t2.sort()
-    return difflib.SequenceMatcher(None, " ".join(t1), " ".join(t2)).ratio()
+    return _ratio(" ".join(t1), " ".join(t2))
 
 def token_set_ratio(s1: str, s2: str) -> float:
     s1 = normalize_title(s1)
@@ -65,9 +78,9 @@ def token_set_ratio(s1: str, s2: str) -> float:
     sorted_t2 = " ".join(sorted(list(t2)))
     
     vals = [
-        difflib.SequenceMatcher(None, sorted_inter, sorted_t1).ratio(),
-        difflib.SequenceMatcher(None, sorted_inter, sorted_t2).ratio(),
-        difflib.SequenceMatcher(None, sorted_t1, sorted_t2).ratio()
+        _ratio(sorted_inter, sorted_t1),
+        _ratio(sorted_inter, sorted_t2),
+        _ratio(sorted_t1, sorted_t2)
     ]
     return max(vals)
 
@@ -175,6 +188,8 @@ class APIBookmaker(SimpleBookmaker):
     live_odds: bool = False # Whether bookmaker provides live odds
     db: Optional[Any] = None
     unauthorized_codes = {401, 403}
+    # Shared clients keyed by proxy URL (None = direct), connection-pooled across bookmakers and requests
+    _clients: Dict[Optional[str], httpx.AsyncClient] = {}
 
     def __init__(self, key: str, config: Dict[str, Any], db: Optional[Any] = None):
         super().__init__(key, config)
@@ -191,6 +206,9 @@ class APIBookmaker(SimpleBookmaker):
         self._error_threshold = 10 # failures
         self._error_window = 300 # seconds (5 mins)
         self._cool_off_duration = 3600 # seconds (1 hour)
+        # Circuit breaker alerts raised while no db session was bound: [(title, message)].
+        # Whoever ran the requests without a session persists them (see scheduler balance update).
+        self.pending_alerts: List[tuple] = []
 
     def should_sync_event(self, event_id: str, commence_time: datetime) -> bool:
         """Determines if an event should be synced based on its start time and last sync."""
@@ -263,6 +281,26 @@ class APIBookmaker(SimpleBookmaker):
         
         return False
 
+    @staticmethod
+    def _get_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+        client = APIBookmaker._clients.get(proxy)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                proxy=proxy,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+            APIBookmaker._clients[proxy] = client
+        return client
+
+    @staticmethod
+    async def aclose():
+        """Closes the shared clients (app shutdown)."""
+        clients = list(APIBookmaker._clients.values())
+        APIBookmaker._clients.clear()
+        for client in clients:
+            await client.aclose()
+
     def _get_rate_limiter(self):
         if self._rate_limiter is None:
             # Simple semaphore-based or sleep-based limiter
@@ -301,6 +339,8 @@ class APIBookmaker(SimpleBookmaker):
                     await nm.send_error_notification(f"Circuit Breaker: {self.title}", msg)
                 except Exception as e:
                     print(f"Failed to send circuit breaker notification: {e}")
+            else:
+                self.pending_alerts.append((f"Circuit Breaker: {self.title}", msg))
             
             # Clear errors so it resets after cool-off
             self._recent_errors = []
@@ -342,64 +382,60 @@ class APIBookmaker(SimpleBookmaker):
             # Add more types as needed
 
         # 3. Execution
-        proxy = self.config.get("proxy", None)
-        if proxy:
-            proxy = {"http": proxy, "https": proxy}
-        else:
-            proxy = None
-        async with httpx.AsyncClient(proxy=proxy) as client:
+        # One proxy URL covers both http and https requests
+        client = self._get_client(self.config.get("proxy") or None)
+        try:
+            res = await client.request(
+                method=method,
+                url=url,
+                json=data,
+                params=params,
+                headers=full_headers,
+                timeout=30.0
+            )
+            res.raise_for_status()
+            return res
+        except httpx.HTTPStatusError as e:
+            # Extract error details first for logging/notification
+            error_content = str(e)
             try:
-                res = await client.request(
-                    method=method,
-                    url=url,
-                    json=data,
-                    params=params,
-                    headers=full_headers,
-                    timeout=30.0
-                )
-                res.raise_for_status()
-                return res
-            except httpx.HTTPStatusError as e:
-                # Extract error details first for logging/notification
-                error_content = str(e)
+                 if e.response:
+                    await e.response.read()
+                    # Capture full response body (e.g. Smarkets JSON error)
+                    resp_text = e.response.text
+                    error_content = f"{e.response.status_code} {e.response.reason_phrase}\nResponse: {resp_text}"
+            except Exception:
+                pass
+
+            # 4a. Auto-Reauthorization Attempt
+            if e.response.status_code in self.unauthorized_codes and retry_auth:
+                print(f"Auth failed ({e.response.status_code}) for {self.key}. Attempting re-authorization...")
                 try:
-                     if e.response:
-                        await e.response.read()
-                        # Capture full response body (e.g. Smarkets JSON error)
-                        resp_text = e.response.text
-                        error_content = f"{e.response.status_code} {e.response.reason_phrase}\nResponse: {resp_text}"
-                except Exception:
-                    pass
-
-                # 4a. Auto-Reauthorization Attempt
-                if e.response.status_code in self.unauthorized_codes and retry_auth:
-                    print(f"Auth failed ({e.response.status_code}) for {self.key}. Attempting re-authorization...")
-                    try:
-                        auth_success = await self.authorize()
-                        if auth_success:
-                            print(f"Re-authorization successful for {self.key}. Retrying request...")
-                            # Retry request with updated credentials (self.api_token updated by authorize)
-                            return await self.make_request(
-                                method, endpoint, data, params, headers, use_auth, retry_auth=False
-                            )
-                        else:
-                            print(f"Re-authorization failed for {self.key}. Error: {error_content}")
-                    except Exception as auth_error:
-                        print(f"Error during re-authorization for {self.key}: {auth_error}")
-
-                # 4b. Circuit Breaker Logic (pass detailed error)
-                await self._handle_request_error(last_error=error_content)
-                
-                print(f"HTTPStatusError in make_request for {url}: {error_content}")
-                # Re-raise with the detailed message
-                raise Exception(error_content) from e
-            except Exception as e:
-                # Trigger circuit breaker logic for connection errors too
-                detailed_error = f"{type(e).__name__}: {str(e)}"
-                await self._handle_request_error(last_error=detailed_error)
+                    auth_success = await self.authorize()
+                    if auth_success:
+                        print(f"Re-authorization successful for {self.key}. Retrying request...")
+                        # Retry request with updated credentials (self.api_token updated by authorize)
+                        return await self.make_request(
+                            method, endpoint, data, params, headers, use_auth, retry_auth=False
+                        )
+                    else:
+                        print(f"Re-authorization failed for {self.key}. Error: {error_content}")
+                except Exception as auth_error:
+                    print(f"Error during re-authorization for {self.key}: {auth_error}")
+
+            # 4b. Circuit Breaker Logic (pass detailed error)
+            await self._handle_request_error(last_error=error_content)
+            
+            print(f"HTTPStatusError in make_request for {url}: {error_content}")
+            # Re-raise with the detailed message
+            raise Exception(error_content) from e
+        except Exception as e:
+            # Trigger circuit breaker logic for connection errors too
+            detailed_error = f"{type(e).__name__}: {str(e)}"
+            await self._handle_request_error(last_error=detailed_error)
 
-                print(f"Exception in make_request for {url}: {detailed_error}")
-                raise e
+            print(f"Exception in make_request for {url}: {detailed_error}")
+            raise e
 
     @classmethod
     def get_config_schema(cls) -> List[Dict[str, Any]]:
@@ -550,16 +586,17 @@ class APIBookmaker(SimpleBookmaker):
         
         best_match = None
         best_score = 0.0
+        own_prefix = f"{self.key}_"
+        norm_source = normalize_title(external_name)
         
         for cand in candidates:
             # Skip leagues from this same bookmaker
-            if cand.key.startswith(f"{self.key}_"):
+            if cand.key.startswith(own_prefix):
                 continue
                 
             # Calculate scores
-            norm_source = normalize_title(external_name)
             norm_cand = normalize_title(cand.title)
-            score_simple = difflib.SequenceMatcher(None, norm_source, norm_cand).ratio()
+            score_simple = _ratio(norm_source, norm_cand)
             score_sort = token_sort_ratio(external_name, cand.title)
             score_set = token_set_ratio(external_name, cand.title)
             
@@ -1,4 +1,5 @@
 from typing import Dict, Any, List, Optional
+import asyncio
 import time
 from datetime import datetime, timezone
 
@@ -8,6 +9,16 @@ from app.services.bookmakers.sx_bet_market_types import MarketType
 from app.db.models import Bet
 from app.schemas.odds import OddsEvent, OddsBookmaker, OddsMarket, OddsOutcome, OddsSport
 
+try:
+    # Optional fast JSON parser for the large /orders/odds/best payloads (pip install "betfinder[speedups]")
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+def _json(response) -> Any:
+    """Parsed body of a (fully read) httpx response."""
+    return _json_loads(response.content)
+
 # Constants for SX Network (Chain ID 4162)
 SX_MAINNET_TOKENS = {
     "USDC": {"address": "0x6629Ce1Cf35Cc1329ebB4F63202F3f197b3F050B", "decimals": 6},
@@ -107,14 +118,14 @@ class SXBetBookmaker(APIBookmaker):
         standardized_sports = []
         
         try:
-            # 1. Fetch Sports AND Leagues
-            # /leagues/active endpoint 
-            res_leagues = await self.make_request("GET", "/leagues/active")
-            leagues_data = res_leagues.json().get("data", [])
-            
-            # /sports endpoint
-            res_sports = await self.make_request("GET", "/sports")
-            sports_data = res_sports.json().get("data", [])
+            # 1. Fetch Sports AND Leagues (independent requests, made concurrently)
+            # /leagues/active and /sports endpoints
+            res_leagues, res_sports = await asyncio.gather(
+                self.make_request("GET", "/leagues/active"),
+                self.make_request("GET", "/sports")
+            )
+            leagues_data = _json(res_leagues).get("data", [])
+            sports_data = _json(res_sports).get("data", [])
             
             # Map Sport ID to Sport Name
             sport_map = {s["sportId"]: s["label"] for s in sports_data}
@@ -172,7 +183,7 @@ class SXBetBookmaker(APIBookmaker):
             # GET /fixture/active?leagueId=...
             res = await self.make_request("GET", "/fixture/active", params={"leagueId": league_id})
             # Response: {"status": "success", "data": [...]}
-            data = res.json().get("data", [])
+            data = _json(res).get("data", [])
             
             # SX Bet fixtures (data) format:
             # { "participantOneName": ..., "startDate": ..., "eventId": "L6206070", ... }
@@ -212,7 +223,7 @@ class SXBetBookmaker(APIBookmaker):
                 print(f"Error fetching markets: {res_markets.status_code}")
                 return []
                 
-            markets_data = res_markets.json().get("data", {}).get("markets", [])
+            markets_data = _json(res_markets).get("data", {}).get("markets", [])
             # Map marketHash -> Market Info
             market_map = {m["marketHash"]: m for m in markets_data}
             
@@ -225,7 +236,7 @@ class SXBetBookmaker(APIBookmaker):
                 "leagueIds": league_id,
                 "baseToken": self.base_token
             })
-            odds_data = res_odds.json().get("data", {}).get("bestOdds", [])
+            odds_data = _json(res_odds).get("data", {}).get("bestOdds", [])
             
             # 4. Construct Result
             # Pre-scan to identify all market types present for each event
@@ -1,10 +1,15 @@
 
 from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
 import hashlib
-from typing import List, Optional, Dict, Any
+import time
+from functools import lru_cache
+from typing import Iterable, List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, and_, func
+from sqlalchemy import select, insert, update, delete, and_, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.services.the_odds_api import TheOddsAPIClient
 from app.services.standardizer import DataStandardizer
 from app.db.models import Sport, League, Event, Market, Odds, Bookmaker, Mapping
@@ -18,14 +23,117 @@ from app.services.notifications.manager import NotificationManager
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=8192)
+def _event_id(league_slug: str, home_team: str, away_team: str, iso_time: str) -> str:
+    """
+    Deterministic internal event ID. Memoized, as the same event is usually
+    returned by several sources in one sync.
+    """
+    # NUL separators avoid 'a_b'+'c' vs 'a'+'b_c' collisions.
+    return hashlib.blake2b(
+        "\0".join((league_slug, home_team, away_team, iso_time)).encode(),
+        digest_size=16
+    ).hexdigest()
+
 class DataIngester:
-    def __init__(self, api_client: TheOddsAPIClient, standardizer: DataStandardizer = None):
+    # Max concurrent TheOddsAPI requests when syncing several leagues at once
+    FETCH_CONCURRENCY = 8
+    # Seconds a cached Sport/League/Bookmaker lookup stays valid
+    LOOKUP_CACHE_TTL = 300
+    # Max candidates (closest by trigram similarity) fuzzy matched per event on PostgreSQL
+    FUZZY_CANDIDATE_LIMIT = 5
+    # Events written (and committed) per batch by _process_odds_data
+    ODDS_CHUNK_SIZE = 500
+
+    def __init__(
+        self,
+        api_client: TheOddsAPIClient,
+        standardizer: DataStandardizer = None,
+        notification_manager: Optional[NotificationManager] = None
+    ):
         self.api_client = api_client
         self.standardizer = standardizer
+        # Created lazily on the first error (see _get_notif_manager) and reused afterwards
+        self.notif_manager = notification_manager
         self.sport_repo = BaseRepository(Sport)
         self.league_repo = BaseRepository(League)
         self.event_repo = BaseRepository(Event)
         self.bookmaker_repo = BaseRepository(Bookmaker)
+        
+        # In-process TTL caches for small, rarely changing tables: key -> (value, expires_at)
+        self._sport_cache: Dict[str, tuple] = {} # sport key -> (True, expires_at) once refreshed
+        self._league_cache: Dict[str, tuple] = {} # league key -> (parent sport key or None, expires_at)
+        self._bookmaker_cache: Dict[str, tuple] = {} # bookmaker key -> (bookmaker id, expires_at)
+        # Bookmakers created (flushed) in the current, uncommitted transaction: key -> id.
+        # Moved into _bookmaker_cache on commit and dropped on failure, so a rolled back id is never reused.
+        self._uncommitted_bookmaker_ids: Dict[str, int] = {}
+
+    def _get_notif_manager(self, db: AsyncSession) -> NotificationManager:
+        """Shared NotificationManager, rebuilt only if the ingester is used with another session."""
+        if self.notif_manager is None or self.notif_manager.db is not db:
+            self.notif_manager = NotificationManager(db)
+        return self.notif_manager
+
+    def _cache_get(self, cache: Dict[str, tuple], key: str) -> Any:
+        """Return the cached value for key, or None if missing/expired."""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() > expires_at:
+            del cache[key]
+            return None
+        return value
+
+    def _cache_set(self, cache: Dict[str, tuple], key: str, value: Any):
+        cache[key] = (value, time.monotonic() + self.LOOKUP_CACHE_TTL)
+
+    async def _get_league_sport_key(self, db: AsyncSession, league_key: str) -> Optional[str]:
+        """Parent sport key of a league (None if the league is unknown), cached."""
+        entry = self._cache_get(self._league_cache, league_key)
+        if entry is not None:
+            return entry[0]
+        league = await db.get(League, league_key)
+        sport_key = league.sport_key if league else None
+        # Wrapped in a tuple so unknown leagues (None) are cached too
+        self._cache_set(self._league_cache, league_key, (sport_key,))
+        return sport_key
+
+    async def _get_bookmaker_id(
+        self, db: AsyncSession, key: str, title: str, last_update: datetime
+    ) -> int:
+        """Id of the bookmaker with this key, creating it if missing. Cached once committed."""
+        bookmaker_id = self._cache_get(self._bookmaker_cache, key)
+        if bookmaker_id is None:
+            bookmaker_id = self._uncommitted_bookmaker_ids.get(key)
+        if bookmaker_id is not None:
+            return bookmaker_id
+        
+        result = await db.execute(select(Bookmaker.id).where(Bookmaker.key == key))
+        bookmaker_id = result.scalar_one_or_none()
+        
+        if bookmaker_id is None:
+            bookmaker = Bookmaker(
+                key=key,
+                title=title,
+                last_update=last_update
+            )
+            db.add(bookmaker)
+            # Flush (not commit) to get the PK; committed with the rest of the payload
+            await db.flush()
+            self._uncommitted_bookmaker_ids[key] = bookmaker.id
+            return bookmaker.id
+        
+        self._cache_set(self._bookmaker_cache, key, bookmaker_id)
+        return bookmaker_id
+
+    async def _commit_chunk(self, db: AsyncSession):
+        """Commit, then cache the ids of bookmakers created in the committed transaction."""
+        await db.commit()
+        for key, bookmaker_id in self._uncommitted_bookmaker_ids.items():
+            self._cache_set(self._bookmaker_cache, key, bookmaker_id)
+        self._uncommitted_bookmaker_ids.clear()
 
     async def sync_sports(self, db: AsyncSession):
         logger.info("Starting sync_sports...")
@@ -65,8 +173,7 @@ class DataIngester:
             error_msg = f"Failed to fetch sports from TheOddsAPI: {e}"
             logger.error(error_msg)
             # Send Notification
-            notif_manager = NotificationManager(db)
-            await notif_manager.send_error_notification("Sync Sports Failed (TOA)", error_msg)
+            await self._get_notif_manager(db).send_error_notification("Sync Sports Failed (TOA)", error_msg)
 
         # 2. Fetch from other Active API Bookmakers
         from app.services.bookmakers.base import BookmakerFactory
@@ -89,8 +196,7 @@ class DataIngester:
             except Exception as e:
                 error_msg = f"Failed to fetch sports from {bk_model.title}: {e}"
                 logger.error(error_msg)
-                notif_manager = NotificationManager(db)
-                await notif_manager.send_error_notification(f"Sync Sports Failed ({bk_model.title})", error_msg)
+                await self._get_notif_manager(db).send_error_notification(f"Sync Sports Failed ({bk_model.title})", error_msg)
         
         logger.info("sync_sports completed.")
 
@@ -99,59 +205,76 @@ class DataIngester:
         Process sports/leagues data from any source.
         Bookmakers should have already resolved mappings and returned internal keys.
         """
+        from app.schemas.sports_config import POPULAR_SPORT_KEYS
+
+        # Keyed rows, so duplicates collapse (ON CONFLICT cannot touch a row twice per statement)
+        sport_rows: Dict[str, Dict[str, Any]] = {}
+        league_rows: Dict[str, Dict[str, Any]] = {}
         for item in data:
             if isinstance(item, dict):
                  # Fallback/Error guard
                  raise ValueError("Received dict instead of OddsSport model")
 
-            key = item.key
-            group = item.group
-            title = item.title
-            active = item.active
-            has_outrights = item.has_outrights
-            
             # Standardize Sport First
-            sport_key = group.lower().replace(" ", "")
-            
-            # Ensure Sport Exists
-            existing_sport = await self.sport_repo.get(db, sport_key)
-            if existing_sport:
-                await self.sport_repo.update(db, db_obj=existing_sport, obj_in={
-                    "active": True,
-                    "updated_at": func.now()
-                })
-            else:
-                logger.debug(f"Creating new sport: {sport_key}")
-                existing_sport = await self.sport_repo.create(db, obj_in={
+            sport_key = item.group.lower().replace(" ", "")
+
+            # Skip sports refreshed recently, many leagues share a sport
+            if not self._cache_get(self._sport_cache, sport_key):
+                sport_rows[sport_key] = {
                     "key": sport_key,
-                    "title": group,
-                    "group": group,
+                    "title": item.group,
+                    "group": item.group,
                     "active": True
-                })
-
-            # Update or Create League
-            existing_league = await self.league_repo.get(db, key)
-            if existing_league:
-                 await self.league_repo.update(db, db_obj=existing_league, obj_in={
-                     "active": active,
-                     "group": group, 
-                     "has_outrights": has_outrights, 
-                     "sport_key": sport_key
-                 })
-            else:
-                logger.debug(f"Creating new league: {key}")
-                from app.schemas.sports_config import POPULAR_SPORT_KEYS
-                is_popular = key in POPULAR_SPORT_KEYS
-                
-                await self.league_repo.create(db, obj_in={
-                    "key": key,
-                    "active": active,
-                    "title": title,
-                    "group": group,
-                    "has_outrights": has_outrights,
-                    "sport_key": sport_key,
-                    "popular": is_popular
-                })
+                }
+
+            league_rows[item.key] = {
+                "key": item.key,
+                "active": item.active,
+                "title": item.title,
+                "group": item.group,
+                "has_outrights": item.has_outrights,
+                "sport_key": sport_key,
+                # Only applied on insert, existing leagues keep their popular flag
+                "popular": item.key in POPULAR_SPORT_KEYS
+            }
+
+        # Upsert Sports (one statement)
+        if sport_rows:
+            stmt = self._dialect_insert(db, Sport)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Sport.key],
+                set_={"active": True, "updated_at": func.now()}
+            )
+            await db.execute(stmt, list(sport_rows.values()))
+
+        # Upsert Leagues (one statement)
+        if league_rows:
+            stmt = self._dialect_insert(db, League)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[League.key],
+                set_={
+                    "active": stmt.excluded.active,
+                    "group": stmt.excluded.group,
+                    "has_outrights": stmt.excluded.has_outrights,
+                    "sport_key": stmt.excluded.sport_key,
+                    "updated_at": func.now()
+                }
+            )
+            await db.execute(stmt, list(league_rows.values()))
+
+        await db.commit()
+
+        for sport_key in sport_rows:
+            self._cache_set(self._sport_cache, sport_key, True)
+        for league_key in league_rows:
+            self._league_cache.pop(league_key, None)
+
+    @staticmethod
+    def _dialect_insert(db: AsyncSession, model):
+        """INSERT construct supporting on_conflict_do_update for the session's dialect."""
+        if db.get_bind().dialect.name == "postgresql":
+            return pg_insert(model)
+        return sqlite_insert(model)
 
     async def sync_odds(self, db: AsyncSession, sport_key: str):
         odds_data = await self.api_client.get_odds(sport_key, standardizer=self.standardizer, db=db)
@@ -205,25 +328,11 @@ class DataIngester:
 
         logger.info("sync_bookmakers completed.")
 
-    async def sync_league(
-        self, 
-        db: AsyncSession, 
-        league_key: str, 
-        markets: str, 
-        active_bookmakers: List[Any],
-        preset_names: List[str] = []
-    ):
+    def _get_bookmaker_services(self, db: AsyncSession, active_bookmakers: List[Any]):
         """
-        Fetches events and odds for a specific league, consolidating requests.
+        Returns the bookmaker keys to request from TheOddsAPI and the
+        bookmaker services (e.g. SX Bet) that can fetch league odds themselves.
         """
-        logger.info(f"Syncing league: {league_key} (Presets: {','.join(preset_names)})")
-        
-        regions = settings.THE_ODDS_API_REGIONS
-        # Ensure we have a valid market string
-        if not markets:
-            markets = "h2h,spreads,totals"
-
-        # Instantiate bookmaker services for other providers
         from app.services.bookmakers.base import BookmakerFactory
         bookmaker_services = {}
         
@@ -241,39 +350,123 @@ class DataIngester:
             except Exception:
                 pass
         
-        # 1. Fetch from TheOddsAPI
-        # We always try TOA for the 'upcoming' or specific league, assuming TOA key covers it.
+        return toa_bookmaker_keys, bookmaker_services
+
+    async def _fetch_toa_league_odds(
+        self,
+        league_key: str,
+        markets: str,
+        toa_bookmaker_keys: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the raw TheOddsAPI payload for a league.
+        HTTP only (no DB session use), so it can run concurrently for several leagues.
+        """
         try:
-            # logger.debug(f"Fetching TOA odds for {league_key} with markets: {markets}")
             # For Odds API, we should only request acceptable markets, otherwise api will return an error.
             odds_markets = ",".join([m for m in markets.split(",") if m in ['h2h','spreads','totals','outrights']])
-            odds_data = await self.api_client.get_odds(
+            return await self.api_client.fetch_odds_raw(
                 sport_key=league_key,
-                regions=regions,
+                regions=settings.THE_ODDS_API_REGIONS,
                 markets=odds_markets,
-                bookmakers=",".join(toa_bookmaker_keys),
-                standardizer=self.standardizer,
-                db=db
+                bookmakers=",".join(toa_bookmaker_keys)
             )
-            await self._process_odds_data(db, odds_data)
         except Exception as toa_error:
             logger.error(f"TheOddsAPI fetch failed for {league_key}: {toa_error}")
+            return []
+
+    async def _collect_league_odds(
+        self,
+        db: AsyncSession,
+        league_key: str,
+        markets: str,
+        toa_raw: List[Dict[str, Any]],
+        bookmaker_services: Dict[str, Any]
+    ) -> List[OddsEvent]:
+        """
+        Builds the TheOddsAPI events for a league from its raw payload and adds
+        the events fetched from custom bookmaker services.
+        Uses the DB session, so calls must not run concurrently.
+        """
+        odds_data = []
+        try:
+            odds_data.extend(await self.api_client.build_odds_events(
+                toa_raw, standardizer=self.standardizer, db=db
+            ))
+        except Exception as toa_error:
+            logger.error(f"TheOddsAPI odds parsing failed for {league_key}: {toa_error}")
             
-        # 2. Fetch from Custom Bookmaker Services (e.g. SX Bet)
+        # Fetch from Custom Bookmaker Services (e.g. SX Bet)
+        # These share the DB session and are rate limited per instance, so they run sequentially.
         for bk_key, bk_service in bookmaker_services.items():
             try:
                 # Parse markets string to list for filtering if supported
                 allowed_markets = markets.split(",") if markets else None
                 # logger.debug(f"Fetching {bk_key} odds for {league_key}...")
-                odds_data = await bk_service.fetch_league_odds(league_key, allowed_markets=allowed_markets)
-                if odds_data:
-                    await self._process_odds_data(db, odds_data)
+                bk_odds = await bk_service.fetch_league_odds(league_key, allowed_markets=allowed_markets)
+                if bk_odds:
+                    odds_data.extend(bk_odds)
             except Exception as bk_error:
                  logger.error(f"{bk_key} fetch failed for {league_key}: {bk_error}")
 
+        return odds_data
+
+    async def sync_league(
+        self, 
+        db: AsyncSession, 
+        league_key: str, 
+        markets: str, 
+        active_bookmakers: List[Any],
+        preset_names: Iterable[str] = (),
+        toa_raw: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Fetches events and odds for a specific league, consolidating requests.
+        Pass `toa_raw` (see prefetch_league_odds) to reuse an already fetched TheOddsAPI payload.
+        """
+        logger.info(f"Syncing league: {league_key} (Presets: {','.join(preset_names)})")
+        
+        # Ensure we have a valid market string
+        if not markets:
+            markets = "h2h,spreads,totals"
+
+        toa_bookmaker_keys, bookmaker_services = self._get_bookmaker_services(db, active_bookmakers)
+        
+        # We always try TOA for the 'upcoming' or specific league, assuming TOA key covers it.
+        if toa_raw is None:
+            toa_raw = await self._fetch_toa_league_odds(league_key, markets, toa_bookmaker_keys)
+        odds_data = await self._collect_league_odds(db, league_key, markets, toa_raw, bookmaker_services)
+        await self._process_odds_data(db, odds_data, allowed_markets=frozenset(markets.split(",")))
+
+    async def prefetch_league_odds(
+        self,
+        league_markets: Dict[str, str],
+        active_bookmakers: List[Any]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetches the raw TheOddsAPI payloads of several leagues concurrently
+        (at most FETCH_CONCURRENCY at a time). Maps league key -> payload for sync_league.
+        HTTP only, the session-bound processing stays sequential in sync_league.
+        """
+        toa_bookmaker_keys = [bk_model.key for bk_model in active_bookmakers]
+        semaphore = asyncio.Semaphore(self.FETCH_CONCURRENCY)
+        
+        async def fetch_one(league_key: str, markets: str):
+            async with semaphore:
+                return await self._fetch_toa_league_odds(
+                    league_key, markets or "h2h,spreads,totals", toa_bookmaker_keys
+                )
+        
+        payloads = await asyncio.gather(
+            *(fetch_one(league_key, markets) for league_key, markets in league_markets.items())
+        )
+        return dict(zip(league_markets, payloads))
+
     async def sync_data_for_preset(self, db: AsyncSession, preset: Any):
         """
         Wrapper for single-preset sync (legacy support).
+        TheOddsAPI requests for all leagues are made concurrently, then the
+        combined odds are written in a single batch.
         """
         # logger.warning(f"sync_data_for_preset is deprecated. Use scheduler aggregation.")
         
@@ -289,8 +482,21 @@ class DataIngester:
         result = await db.execute(select(Bookmaker).where(Bookmaker.active == True, Bookmaker.model_type == 'api'))
         active_bookmakers = result.scalars().all()
         
-        for league_key in leagues:
-            await self.sync_league(db, league_key, markets, active_bookmakers, [preset.name])
+        _, bookmaker_services = self._get_bookmaker_services(db, active_bookmakers)
+        
+        toa_payloads = await self.prefetch_league_odds(
+            {league_key: markets for league_key in leagues}, active_bookmakers
+        )
+        
+        odds_data = []
+        for league_key, toa_raw in toa_payloads.items():
+            logger.info(f"Syncing league: {league_key} (Presets: {preset.name})")
+            odds_data.extend(
+                await self._collect_league_odds(db, league_key, markets, toa_raw, bookmaker_services)
+            )
+        
+        allowed_markets = frozenset(preset.markets) if preset.markets else None
+        await self._process_odds_data(db, odds_data, allowed_markets=allowed_markets)
 
 
 
@@ -301,10 +507,13 @@ class DataIngester:
         commence_time: datetime,
         home_team: str,
         away_team: str,
-        time_tolerance_minutes: int = 5
+        time_tolerance_minutes: int = 5,
+        pending_events: Iterable[Dict[str, Any]] = ()
     ) -> Optional[str]:
         """
         Find existing event by league + time + team fuzzy match.
+        `pending_events` are event rows not yet written (the current chunk's), matched
+        the same way as the rows in the DB.
         Returns event ID if found, None otherwise.
         """
         from datetime import timedelta
@@ -315,16 +524,37 @@ class DataIngester:
         time_end = commence_time + timedelta(minutes=time_tolerance_minutes)
         
         # Query events in same league and time window
-        result = await db.execute(
-            select(Event).where(
-                and_(
-                    Event.league_key == league_key,
-                    Event.commence_time >= time_start,
-                    Event.commence_time <= time_end
-                )
+        stmt = select(Event).where(
+            and_(
+                Event.league_key == league_key,
+                Event.commence_time >= time_start,
+                Event.commence_time <= time_end
+            )
+        )
+        
+        if db.get_bind().dialect.name == "postgresql":
+            # Prefilter with pg_trgm (GIN indexed) so only the closest few candidates
+            # reach the Python fuzzy matcher. '%' uses pg_trgm.similarity_threshold (0.3),
+            # loose enough to keep any pair that could pass the 0.85 check below.
+            similarity = (
+                func.similarity(Event.home_team, home_team) +
+                func.similarity(Event.away_team, away_team)
             )
+            stmt = stmt.where(
+                or_(
+                    Event.home_team.op("%")(home_team),
+                    Event.away_team.op("%")(away_team)
+                )
+            ).order_by(similarity.desc()).limit(self.FUZZY_CANDIDATE_LIMIT)
+        
+        result = await db.execute(stmt)
+        # (id, home_team, away_team) of every candidate, stored or pending
+        candidates = [(e.id, e.home_team, e.away_team) for e in result.scalars().all()]
+        candidates.extend(
+            (row["id"], row["home_team"], row["away_team"])
+            for row in pending_events
+            if row["league_key"] == league_key and time_start <= row["commence_time"] <= time_end
         )
-        candidates = result.scalars().all()
         
         if not candidates:
             return None
@@ -335,8 +565,8 @@ class DataIngester:
         
         for candidate in candidates:
             # Calculate fuzzy match scores for both teams
-            home_score = token_sort_ratio(home_team, candidate.home_team)
-            away_score = token_sort_ratio(away_team, candidate.away_team)
+            home_score = token_sort_ratio(home_team, candidate[1])
+            away_score = token_sort_ratio(away_team, candidate[2])
             
             # Average score (both teams must match well)
             avg_score = (home_score + away_score) / 2.0
@@ -347,12 +577,48 @@ class DataIngester:
         
         # Return match if confidence is high
         if best_score > 0.85 and best_match:
-            logger.info(f"Matched event '{home_team} vs {away_team}' to existing '{best_match.home_team} vs {best_match.away_team}' (score: {best_score:.2f})")
-            return best_match.id
+            logger.info(f"Matched event '{home_team} vs {away_team}' to existing '{best_match[1]} vs {best_match[2]}' (score: {best_score:.2f})")
+            return best_match[0]
         
         return None
 
-    async def _process_odds_data(self, db: AsyncSession, odds_data: List[OddsEvent]):
+    async def _process_odds_data(
+        self,
+        db: AsyncSession,
+        odds_data: List[OddsEvent],
+        allowed_markets: Optional[frozenset] = None
+    ):
+        """
+        Persists events, markets and odds, ODDS_CHUNK_SIZE events at a time.
+        Each chunk is written and committed before the next one is built, so the
+        intermediate rows held in memory stay bounded by the chunk, not the payload.
+        Lay markets, and markets not in `allowed_markets` (if given), are skipped.
+        """
+        for start in range(0, len(odds_data), self.ODDS_CHUNK_SIZE):
+            try:
+                await self._process_odds_chunk(
+                    db, odds_data[start:start + self.ODDS_CHUNK_SIZE], allowed_markets
+                )
+            except Exception:
+                # Bookmakers flushed in the failed chunk's transaction won't exist after rollback
+                self._uncommitted_bookmaker_ids.clear()
+                raise
+
+    async def _process_odds_chunk(
+        self,
+        db: AsyncSession,
+        odds_data: List[OddsEvent],
+        allowed_markets: Optional[frozenset] = None
+    ):
+        # Markets and Odds are collected across the whole chunk and written in bulk
+        # at the end, rather than one INSERT (and commit) per row.
+        # Each entry: (event_id, bookmaker id, bookmaker data, market data)
+        market_entries = []
+        # event_id -> Event row
+        event_rows = {}
+        # bookmaker id -> last_update reported in this payload
+        bookmaker_updates = {}
+
         for event_data in odds_data:
             # Handle both Pydantic model and Dict (for backward compatibility if needed, or strict model)
             if isinstance(event_data, dict):
@@ -369,43 +635,33 @@ class DataIngester:
             league_slug = event_data.sport_key
             
             # Lookup league to get the actual parent sport key (e.g. 'soccer')
-            league = await db.get(League, league_slug)
-            parent_sport_key = league.sport_key if league else league_slug
+            parent_sport_key = await self._get_league_sport_key(db, league_slug) or league_slug
             
             home_team = event_data.home_team
             away_team = event_data.away_team
             
-            # Try to find existing event using fuzzy matching
+            # Try to find existing event using fuzzy matching, including the events
+            # earlier in this chunk that are only upserted after the loop
             event_id = await self._find_existing_event(
-                db, league_slug, commence_time, home_team, away_team
+                db, league_slug, commence_time, home_team, away_team,
+                pending_events=event_rows.values()
             )
             
             # If not found, generate deterministic internal ID
             if not event_id:
-                # Use hash of league + teams + time for deterministic ID
-                event_id = hashlib.md5(
-                    f"{league_slug}_{home_team}_{away_team}_{commence_time.isoformat()}".encode()
-                ).hexdigest()
+                # Use hash of league + teams + time for deterministic ID.
+                event_id = _event_id(league_slug, home_team, away_team, commence_time.isoformat())
                 logger.debug(f"Generated new event ID: {event_id} for '{home_team} vs {away_team}'")
             
-            existing_event = await self.event_repo.get(db, event_id)
-            if existing_event:
-               await self.event_repo.update(db, db_obj=existing_event, obj_in={
-                   "commence_time": commence_time,
-                   "home_team": home_team,
-                   "away_team": away_team,
-                   "sport_key": parent_sport_key,
-                   "league_key": league_slug
-               })
-            else:
-                await self.event_repo.create(db, obj_in={
-                    "id": event_id,
-                    "sport_key": parent_sport_key,
-                    "league_key": league_slug,
-                    "commence_time": commence_time,
-                    "home_team": home_team,
-                    "away_team": away_team
-                })
+            # Upserted together with the rest of the chunk below
+            event_rows[event_id] = {
+                "id": event_id,
+                "sport_key": parent_sport_key,
+                "league_key": league_slug,
+                "commence_time": commence_time,
+                "home_team": home_team,
+                "away_team": away_team
+            }
             
             for b_data in event_data.bookmakers:
                 bk_key = b_data.key
@@ -414,99 +670,166 @@ class DataIngester:
                 if last_update.tzinfo is None:
                     last_update = last_update.replace(tzinfo=timezone.utc)
                 
-                result = await db.execute(select(Bookmaker).where(Bookmaker.key == bk_key))
-                bookmaker = result.scalar_one_or_none()
-                
-                if not bookmaker:
-                    bookmaker = Bookmaker(
-                        key=bk_key,
-                        title=bk_title,
-                        last_update=last_update
-                    )
-                    db.add(bookmaker)
-                    await db.commit()
-                    await db.refresh(bookmaker)
-                else:
-                    bookmaker.last_update = last_update
-                    db.add(bookmaker)
+                bookmaker_id = await self._get_bookmaker_id(db, bk_key, bk_title, last_update)
+                bookmaker_updates[bookmaker_id] = last_update
                 
                 for m_data in b_data.markets:
-                    m_key = m_data.key
-                    
-                    result = await db.execute(
-                        select(Market).where(Market.event_id == event_id, Market.key == m_key)
-                    )
-                    market = result.scalar_one_or_none()
-                    
-                    if not market:
-                        market = Market(key=m_key, event_id=event_id)
-                        db.add(market)
-                        await db.commit()
-                        await db.refresh(market)
-                        
-                    # Fetch existing odds for this market and bookmaker
-                    existing_odds_result = await db.execute(
-                        select(Odds).where(Odds.market_id == market.id, Odds.bookmaker_id == bookmaker.id)
-                    )
-                    existing_odds_list = existing_odds_result.scalars().all()
-                    
-                    # Create a map for quick lookup: (selection, point) -> Odds object
-                    # Point can be None, so we handle that.
-                    existing_odds_map = {
-                        (o.selection, o.point): o for o in existing_odds_list
-                    }
-                    
-                    for outcome in m_data.outcomes:
-                        price = outcome.price
-                        name = outcome.selection
-                        point = outcome.point
-                        
-                        # Extract Links (Priority: Outcome > Market > Bookmaker(Event))
-                        # In Pydantic model this logic should ideally be done upstream but we can fallback here
-                        url = outcome.url 
-                        if not url:
-                           url = m_data.link
-                        if not url:
-                           url = b_data.link
-                        
-                        # Extract SIDs
-                        outcome_sid = outcome.sid
-                        market_sid = outcome.market_sid or m_data.sid
-                        event_sid = outcome.event_sid or b_data.sid
-                        
-                        bet_limit = outcome.bet_limit
-
-                        normalized_name = outcome.normalized_selection
-                        # We rely on the model having populated normalized_selection
-                        
-                        # Check if odds exist
-                        existing_odd = existing_odds_map.get((name, point))
-                        
-                        if existing_odd:
-                            # Update existing
-                            existing_odd.price = price
-                            existing_odd.url = url
-                            existing_odd.event_sid = event_sid
-                            existing_odd.market_sid = market_sid
-                            existing_odd.sid = outcome_sid
-                            existing_odd.bet_limit = bet_limit
-                            existing_odd.normalized_selection = normalized_name 
-                            db.add(existing_odd)
-                        else:
-                            # Create new
-                            new_odd = Odds(
-                                market_id=market.id,
-                                bookmaker_id=bookmaker.id,
-                                selection=name,
-                                normalized_selection=normalized_name,
-                                price=price,
-                                point=point,
-                                url=url,
-                                event_sid=event_sid,
-                                market_sid=market_sid,
-                                sid=outcome_sid,
-                                bet_limit=bet_limit
-                            )
-                            db.add(new_odd)
+                    # We skip _lay markets for now (as in TheOddsAPIClient) and markets nobody asked for
+                    if m_data.key.endswith("_lay") or (
+                        allowed_markets is not None and m_data.key not in allowed_markets
+                    ):
+                        continue
+                    market_entries.append((event_id, bookmaker_id, b_data, m_data))
+
+        await self._upsert_events(db, list(event_rows.values()))
+
+        for bookmaker_id, last_update in bookmaker_updates.items():
+            await db.execute(
+                update(Bookmaker).where(Bookmaker.id == bookmaker_id).values(last_update=last_update)
+            )
+
+        if not market_entries:
+            await self._commit_chunk(db)
+            return
+
+        # 1. Resolve Markets: one SELECT for the existing ones, one bulk INSERT for the rest
+        event_ids = {entry[0] for entry in market_entries}
+        result = await db.execute(
+            select(Market.id, Market.event_id, Market.key).where(Market.event_id.in_(event_ids))
+        )
+        market_ids = {(ev_id, m_key): m_id for m_id, ev_id, m_key in result.all()}
+
+        new_markets_rows = {}
+        for event_id, _, _, m_data in market_entries:
+            market_ref = (event_id, m_data.key)
+            if market_ref not in market_ids:
+                new_markets_rows[market_ref] = {"key": m_data.key, "event_id": event_id}
+
+        if new_markets_rows:
+            result = await db.execute(
+                insert(Market).returning(Market.id, Market.event_id, Market.key),
+                list(new_markets_rows.values())
+            )
+            for m_id, ev_id, m_key in result.all():
+                market_ids[(ev_id, m_key)] = m_id
+
+        # 2. Build one row per bookmaker line
+        # Keyed by (market_id, bookmaker_id, selection, point) so repeated outcomes collapse to one row
+        odds_rows = {}
+        for event_id, bookmaker_id, b_data, m_data in market_entries:
+            market_id = market_ids[(event_id, m_data.key)]
+
+            for outcome in m_data.outcomes:
+                # Extract Links (Priority: Outcome > Market > Bookmaker(Event))
+                # In Pydantic model this logic should ideally be done upstream but we can fallback here
+                url = outcome.url 
+                if not url:
+                   url = m_data.link
+                if not url:
+                   url = b_data.link
                 
-        await db.commit()
+                odds_rows[(market_id, bookmaker_id, outcome.selection, outcome.point)] = {
+                    "market_id": market_id,
+                    "bookmaker_id": bookmaker_id,
+                    "selection": outcome.selection,
+                    # We rely on the model having populated normalized_selection
+                    "normalized_selection": outcome.normalized_selection,
+                    "price": outcome.price,
+                    "point": outcome.point,
+                    "url": url,
+                    # Extract SIDs
+                    "event_sid": outcome.event_sid or b_data.sid,
+                    "market_sid": outcome.market_sid or m_data.sid,
+                    "sid": outcome.sid,
+                    "bet_limit": outcome.bet_limit
+                }
+
+        # 3. Write
+        if db.get_bind().dialect.name == "postgresql":
+            await self._upsert_odds(db, list(odds_rows.values()))
+        else:
+            await self._merge_odds(db, odds_rows)
+                
+        await self._commit_chunk(db)
+
+    async def _upsert_events(self, db: AsyncSession, rows: List[Dict[str, Any]]):
+        """Single INSERT ... ON CONFLICT (id) DO UPDATE for the chunk's events (PostgreSQL and SQLite)."""
+        if not rows:
+            return
+        stmt = self._dialect_insert(db, Event)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Event.id],
+            set_={
+                "sport_key": stmt.excluded.sport_key,
+                "league_key": stmt.excluded.league_key,
+                "commence_time": stmt.excluded.commence_time,
+                "home_team": stmt.excluded.home_team,
+                "away_team": stmt.excluded.away_team,
+                "updated_at": func.now()
+            }
+        )
+        await db.execute(stmt, rows)
+
+    async def _upsert_odds(self, db: AsyncSession, rows: List[Dict[str, Any]]):
+        """
+        PostgreSQL: single INSERT ... ON CONFLICT DO UPDATE on
+        ux_odds_market_bookmaker_selection_point (NULLS NOT DISTINCT, so h2h lines match too).
+        """
+        if not rows:
+            return
+        stmt = pg_insert(Odds)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Odds.market_id, Odds.bookmaker_id, Odds.selection, Odds.point],
+            set_={
+                "price": stmt.excluded.price,
+                "url": stmt.excluded.url,
+                "event_sid": stmt.excluded.event_sid,
+                "market_sid": stmt.excluded.market_sid,
+                "sid": stmt.excluded.sid,
+                "bet_limit": stmt.excluded.bet_limit,
+                "normalized_selection": stmt.excluded.normalized_selection,
+                "updated_at": func.now()
+            }
+        )
+        await db.execute(stmt, rows)
+
+    async def _merge_odds(self, db: AsyncSession, odds_rows: Dict[tuple, Dict[str, Any]]):
+        """
+        SQLite (development): unique indexes treat NULL points as distinct, so ON CONFLICT
+        would not match h2h lines. Read existing rows in one query, update them in place
+        and bulk insert the rest.
+        """
+        if not odds_rows:
+            return
+        market_ids = {row["market_id"] for row in odds_rows.values()}
+        bookmaker_ids = {row["bookmaker_id"] for row in odds_rows.values()}
+        existing_odds_result = await db.execute(
+            select(Odds).where(
+                Odds.market_id.in_(market_ids),
+                Odds.bookmaker_id.in_(bookmaker_ids)
+            )
+        )
+        # Create a map for quick lookup: (market_id, bookmaker_id, selection, point) -> Odds object
+        # Point can be None, so we handle that.
+        existing_odds_map = {
+            (o.market_id, o.bookmaker_id, o.selection, o.point): o
+            for o in existing_odds_result.scalars().all()
+        }
+
+        new_odds_rows = []
+        for odds_ref, row in odds_rows.items():
+            existing_odd = existing_odds_map.get(odds_ref)
+            if existing_odd:
+                # Update existing
+                existing_odd.price = row["price"]
+                existing_odd.url = row["url"]
+                existing_odd.event_sid = row["event_sid"]
+                existing_odd.market_sid = row["market_sid"]
+                existing_odd.sid = row["sid"]
+                existing_odd.bet_limit = row["bet_limit"]
+                existing_odd.normalized_selection = row["normalized_selection"]
+            else:
+                new_odds_rows.append(row)
+
+        if new_odds_rows:
+            await db.execute(insert(Odds), new_odds_rows)
@@ -1,15 +1,92 @@
+import asyncio
 import logging
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, cast
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.db.models import Notification, Preset, Bet
 from app.services.notifications.telegram import TelegramNotifier
 from app.services.analytics.trade_finder import TradeOpportunity
 
 logger = logging.getLogger(__name__)
 
+# Emoji Map (keyed by Sport.key)
+SPORT_EMOJIS = {
+    "soccer": "⚽",
+    "basketball": "🏀",
+    "tennis": "🎾",
+    "americanfootball": "🏈",
+    "baseball": "⚾",
+    "icehockey": "🏒",
+    "golf": "⛳",
+    "boxing": "🥊",
+    "mma": "🥋",
+    "rugby": "🏉",
+    "cricket": "🏏"
+}
+DEFAULT_SPORT_EMOJI = "🏆"
+
+TRADE_MESSAGE_TEMPLATE = (
+    "*{preset_name} - New Trade*\n"
+    "{sport_icon} {league_line}\n"
+    "`{home_team}` vs `{away_team}`\n"
+    "⏰ {start_time} GMT\n"
+    "{market_key} - `{selection}` @{price} ({bookmaker_display})\n"
+    "Prob: {prob_str}\n"
+    "Edge: {edge_str}"
+)
+
+BET_MESSAGE_TEMPLATE = (
+    "✅ *{preset_name} - Bet Placed*\n"
+    "{sport_icon} `{home_team}` vs `{away_team}`\n"
+    "{market_key} - `{selection}` @{price} ({bookmaker_display})\n"
+    "Stake: {stake}\n"
+    "Prob: {prob_str}\n"
+    "Edge: {edge_str}"
+)
+
+def _trade_alert_insert(insert_construct):
+    """INSERT ... ON CONFLICT DO NOTHING against ux_notification_trade_dedupe, returning inserted pairs."""
+    return insert_construct(Notification).on_conflict_do_nothing(
+        index_elements=[Notification.type, Notification.preset_id, Notification.odd_id],
+        index_where=Notification.type == "trade_alert"
+    ).returning(Notification.preset_id, Notification.odd_id)
+
+
+# Built once per dialect; rows are attached per batch with .values()
+_TRADE_ALERT_INSERTS = {
+    "postgresql": _trade_alert_insert(pg_insert),
+    "sqlite": _trade_alert_insert(sqlite_insert),
+}
+
+# Recently sent trade alerts: (preset_id, odd_id) -> monotonic send time.
+# Short-circuits the DB dedupe lookup for repeats within a few sync cycles.
+SENT_CACHE_TTL = 300
+SENT_CACHE_MAX_SIZE = 10_000
+_sent_cache: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+
+
+def _seen_recently(key: Tuple[int, int]) -> bool:
+    now = time.monotonic()
+    # Oldest entries first, so stop at the first fresh one
+    while _sent_cache:
+        if now - next(iter(_sent_cache.values())) <= SENT_CACHE_TTL:
+            break
+        _sent_cache.popitem(last=False)
+    return key in _sent_cache
+
+
+def _remember_sent(key: Tuple[int, int]):
+    _sent_cache[key] = time.monotonic()
+    _sent_cache.move_to_end(key)
+    while len(_sent_cache) > SENT_CACHE_MAX_SIZE:
+        _sent_cache.popitem(last=False)
+
+
 class NotificationManager:
     """
     Centralized manager for sending notifications to various channels (Telegram, Browser/WS).
@@ -19,128 +96,108 @@ class NotificationManager:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.telegram = TelegramNotifier()
+        self._dialect_name: Optional[str] = None
+
+    @property
+    def dialect_name(self) -> str:
+        """Dialect of the session's bind ('postgresql' or 'sqlite'), probed once."""
+        if self._dialect_name is None:
+            self._dialect_name = self.db.get_bind().dialect.name
+        return self._dialect_name
 
     async def send_trade_notification(self, preset: Preset, trade: TradeOpportunity):
         """
         Sends a notification for a new trade opportunity if enabled in preset config.
-        Checks for duplicates before sending.
+        Duplicates (same preset and odd) are not sent again.
+        """
+        await self.send_trade_batch([(preset, trade)])
+
+    async def send_trade_batch(self, items: List[Tuple[Preset, TradeOpportunity]]):
+        """
+        Sends notifications for several (preset, trade) pairs.
+        Deduplication is enforced by the ux_notification_trade_dedupe unique index:
+        the whole batch is recorded with one INSERT ... ON CONFLICT DO NOTHING and
+        only the rows actually inserted are sent (concurrently) to Telegram.
+        This is safe against concurrent jobs racing on the same trade.
         """
         # 1. Check Config
-        if not preset.other_config:
+        items = [(preset, trade) for preset, trade in items if self._trade_notifications_enabled(preset)]
+        # Pairs sent by this process in the last few minutes need no DB round-trip
+        items = [(preset, trade) for preset, trade in items if not _seen_recently((preset.id, trade.odd.id))]
+        if not items:
             return
 
-        # Handle string "true"/"false" from the select config
-        notif_enabled = preset.other_config.get("notification_new_bet")
-        if notif_enabled != "true":
-            # Defaults to True? No, defaults to "true" string in config schema, 
-            # but if key missing, we might assume False or True. 
-            # Plan said "defaults to True". 
-            # But if it's explicitly "false", return.
-            # If missing, we can check logic. Schema default is "true".
-            if notif_enabled == "false":
-                return
-            if notif_enabled is None:
-                # Fallback to schema default or safe default
-                # Let's assume enabled by default if not strictly disabled?
-                pass 
-
-        # 2. Deduplication Check
-        # Unique Key: (preset_id, odd_id)
-        # We store this in Notification.data
-        dedupe_key = {
-            "preset_id": preset.id,
-            "odd_id": trade.odd.id
-        }
-        
-        # Dialect check for JSON storage
-        # SQLite stores JSON as Text (mostly), Postgres has native JSON/JSONB
-        # 'Notification.data' is defined as JSON type in models.
-        # Check dialect to decide if we need casting for containment check.
-        # Use get_bind() to retrieve the engine/connection and check the dialect name.
-        dialect_name = "sqlite" # Default
-        try:
-             # Try to get dialect name safely
-             if self.db.bind:
-                 dialect_name = self.db.bind.dialect.name
-        except Exception:
-             pass
-
-        if dialect_name == "postgresql":
-            stmt = select(Notification).where(
-                Notification.type == "trade_alert",
-                cast(Notification.data, JSONB).contains(dedupe_key)
-            )
-        else:
-            stmt = select(Notification).where(
-                Notification.type == "trade_alert",
-                Notification.data.contains(dedupe_key)
-            )
+        # 2. Construct Messages
+        # Unique Key: (preset_id, odd_id), first occurrence in the batch wins
+        messages = {}
+        for preset, trade in items:
+            pair = (preset.id, trade.odd.id)
+            if pair not in messages:
+                messages[pair] = self._build_trade_message(preset, trade)
+
+        # 3. Record Notifications (deduplicated by the unique index)
+        processed_at = datetime.now(timezone.utc)
+        notif_rows = [
+            {
+                "type": "trade_alert",
+                "message": message,
+                "data": {
+                    "preset_id": preset_id,
+                    "odd_id": odd_id
+                },
+                "preset_id": preset_id,
+                "odd_id": odd_id,
+                "sent": True, # Assessing it as sent if we fire the tasks. 
+                "processed_at": processed_at
+            }
+            for (preset_id, odd_id), message in messages.items()
+        ]
+        stmt = _TRADE_ALERT_INSERTS[self.dialect_name].values(notif_rows)
         result = await self.db.execute(stmt)
-        existing = result.first()
-        
-        if existing:
-            logger.debug(f"Skipping duplicate trade notification for Preset {preset.id}, Odd {trade.odd.id}")
-            return
+        inserted = [tuple(row) for row in result.all()]
+        await self.db.commit()
 
-        # 3. Construct Message
-        
-        prob_str = f"{trade.odd.implied_probability:.1%}" if trade.odd.implied_probability else "-"
-        edge_str = f"{trade.edge*100:.1f}%" if trade.edge is not None else "-"
-        
-        # Format commence time nicely
-        start_time = trade.event.commence_time.strftime("%d %b %H:%M") 
-        
-        # Emoji Map
-        sport_emojis = {
-            "soccer": "⚽",
-            "basketball": "🏀",
-            "tennis": "🎾",
-            "americanfootball": "🏈",
-            "baseball": "⚾",
-            "icehockey": "🏒",
-            "golf": "⛳",
-            "boxing": "🥊",
-            "mma": "🥋",
-            "rugby": "🏉",
-            "cricket": "🏏"
-        }
-        # Fallback to generic trophy if not found
-        # trade.sport.key is usually lowercased compacted e.g. 'americanfootball'
-        sport_icon = sport_emojis.get(trade.sport.key, "🏆")
+        for pair in messages:
+            _remember_sent(pair)
+        if len(inserted) < len(messages):
+            logger.debug(f"Skipped {len(messages) - len(inserted)} duplicate trade notification(s)")
+
+        # 4. Send Notifications
         
+        # Telegram
+        await asyncio.gather(*(self.telegram.send_message(messages[pair]) for pair in inserted))
+
+    def _trade_notifications_enabled(self, preset: Preset) -> bool:
+        if not preset.other_config:
+            return False
+
+        # Handle string "true"/"false" from the select config
+        notif_enabled = preset.other_config.get("notification_new_bet")
+        # Schema default is "true", so only an explicit "false" disables it.
+        return notif_enabled != "false"
+
+    def _build_trade_message(self, preset: Preset, trade: TradeOpportunity) -> str:
         # Bookmaker Link
         bookmaker_display = trade.bookmaker.title
         if trade.odd.url:
             bookmaker_display = f"[{trade.bookmaker.title}]({trade.odd.url})"
 
-        # League Line
-        league_line = f"{trade.league.title}" if trade.league else "Unknown League"
-
-        message = (
-            f"*{preset.name} - New Trade*\n"
-            f"{sport_icon} {league_line}\n"
-            f"`{trade.event.home_team}` vs `{trade.event.away_team}`\n"
-            f"⏰ {start_time} GMT\n"
-            f"{trade.market.key.upper()} - `{trade.odd.selection}` @{trade.odd.price} ({bookmaker_display})\n"
-            f"Prob: {prob_str}\n"
-            f"Edge: {edge_str}"
-        )
-
-        # 4. Send Notifications
-        
-        # Telegram
-        await self.telegram.send_message(message)
-        
-        # 5. Record Notification
-        new_notification = Notification(
-            type="trade_alert",
-            message=message,
-            data=dedupe_key,
-            sent=True, # Assessing it as sent if we fired the tasks. 
-            processed_at=datetime.now(timezone.utc)
-        )
-        self.db.add(new_notification)
-        await self.db.commit()
+        return TRADE_MESSAGE_TEMPLATE.format_map({
+            "preset_name": preset.name,
+            # trade.sport.key is usually lowercased compacted e.g. 'americanfootball'
+            "sport_icon": SPORT_EMOJIS.get(trade.sport.key, DEFAULT_SPORT_EMOJI),
+            "league_line": trade.league.title if trade.league else "Unknown League",
+            "home_team": trade.event.home_team,
+            "away_team": trade.event.away_team,
+            # Format commence time nicely
+            "start_time": format(trade.event.commence_time, "%d %b %H:%M"),
+            "market_key": trade.market.key.upper(),
+            "selection": trade.odd.selection,
+            "price": trade.odd.price,
+            "bookmaker_display": bookmaker_display,
+            "prob_str": f"{trade.odd.implied_probability:.1%}" if trade.odd.implied_probability else "-",
+            "edge_str": f"{trade.edge*100:.1f}%" if trade.edge is not None else "-",
+        })
 
     async def send_error_notification(self, title: str, message: str):
         """
@@ -148,10 +205,7 @@ class NotificationManager:
         """
         full_message = f"🚨 *{title}* 🚨\n\n{message}"
         
-        # Telegram
-        await self.telegram.send_message(full_message)
-        
-        # Database Record
+        # Telegram and Database Record, concurrently
         new_notification = Notification(
             type="error",
             message=full_message,
@@ -159,8 +213,10 @@ class NotificationManager:
             sent=True,
             processed_at=datetime.now(timezone.utc)
         )
-        self.db.add(new_notification)
-        await self.db.commit()
+        await asyncio.gather(
+            self.telegram.send_message(full_message),
+            self._persist_notification(new_notification)
+        )
 
     async def send_bet_notification(self, preset: Preset, bet: Bet):
         """
@@ -181,27 +237,12 @@ class NotificationManager:
         # 2. Construct Message
         # Similar to trade notification but indicates "Bet Placed"
         
-        # Emoji Map
-        sport_emojis = {
-            "soccer": "⚽",
-            "basketball": "🏀",
-            "tennis": "🎾",
-            "americanfootball": "🏈",
-            "baseball": "⚾",
-            "icehockey": "🏒",
-            "golf": "⛳",
-            "boxing": "🥊",
-            "mma": "🥋",
-            "rugby": "🏉",
-            "cricket": "🏏"
-        }
-        
         # Extract sport key from event_data snapshot or relationship
         sport_key = "unknown"
         if bet.event_data and "sport_key" in bet.event_data:
             sport_key = bet.event_data["sport_key"]
         
-        sport_icon = sport_emojis.get(sport_key, "🏆")
+        sport_icon = SPORT_EMOJIS.get(sport_key, DEFAULT_SPORT_EMOJI)
         
         # Details
         home_team = bet.event_data.get("home_team") if bet.event_data else "Unknown"
@@ -227,24 +268,30 @@ class NotificationManager:
             if bet.odd_data.get("implied_probability"):
                 prob_str = f"{bet.odd_data['implied_probability']:.1%}"
 
-        message = (
-            f"✅ *{preset.name} - Bet Placed*\n"
-            f"{sport_icon} `{home_team}` vs `{away_team}`\n"
-            f"{market_key} - `{selection}` @{price} ({bookmaker_display})\n"
-            f"Stake: {bet.stake}\n"
-            f"Prob: {prob_str}\n"
-            f"Edge: {edge_str}"
-        )
+        message = BET_MESSAGE_TEMPLATE.format_map({
+            "preset_name": preset.name,
+            "sport_icon": sport_icon,
+            "home_team": home_team,
+            "away_team": away_team,
+            "market_key": market_key,
+            "selection": selection,
+            "price": price,
+            "bookmaker_display": bookmaker_display,
+            "stake": bet.stake,
+            "prob_str": prob_str,
+            "edge_str": edge_str,
+        })
 
         # 3. Send Notification
-        logger.info(f"Sending Telegram notification for bet {bet.id}...")
-        try:
-            await self.telegram.send_message(message)
-            logger.info("Telegram notification sent successfully.")
-        except Exception as e:
-            logger.error(f"Failed to send Telegram notification: {e}", exc_info=True)
+        async def send_telegram():
+            logger.info(f"Sending Telegram notification for bet {bet.id}...")
+            try:
+                await self.telegram.send_message(message)
+                logger.info("Telegram notification sent successfully.")
+            except Exception as e:
+                logger.error(f"Failed to send Telegram notification: {e}", exc_info=True)
         
-        # 4. Record Notification
+        # 4. Record Notification (concurrently with the Telegram request)
         # Unique Key: (bet_id)
         dedupe_key = {
             "type": "bet_placed",
@@ -258,5 +305,12 @@ class NotificationManager:
             sent=True,
             processed_at=datetime.now(timezone.utc)
         )
-        self.db.add(new_notification)
+        await asyncio.gather(send_telegram(), self._persist_notification(new_notification))
+
+    async def _persist_notification(self, notification: Notification):
+        """
+        Adds and commits a notification record. Only this coroutine touches the session,
+        so it can run alongside the (HTTP only) Telegram send.
+        """
+        self.db.add(notification)
         await self.db.commit()
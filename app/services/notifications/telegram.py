@@ -1,6 +1,7 @@
-
+import asyncio
 import httpx
 import hashlib
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from app.core.config import settings
 import logging
@@ -9,42 +10,66 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 class TelegramNotifier:
-    BASE_URL = "https://api.telegram.org/bot"
-    _cache = {} # Simple in-memory cache for deduplication
+    BASE_URL = "https://api.telegram.org"
+    # Max concurrent sendMessage requests (Telegram allows ~30 messages/second per bot)
+    MAX_CONCURRENT_SENDS = 30
+    # In-memory LRU for deduplication: message hash -> last sent time
+    DEDUPE_CACHE_SIZE = 4096
+    _cache: "OrderedDict[str, datetime]" = OrderedDict()
+    _client: Optional[httpx.AsyncClient] = None # Shared, connection-pooled across instances
+    _send_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
 
     def __init__(self, token: Optional[str] = settings.TELEGRAM_BOT_TOKEN, chat_id: Optional[str] = settings.TELEGRAM_CHAT_ID):
         self.token = token
         self.chat_id = chat_id
 
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                base_url=cls.BASE_URL,
+                timeout=10,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10, keepalive_expiry=75)
+            )
+        return cls._client
+
+    @classmethod
+    async def aclose(cls):
+        """Closes the shared client (app shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
     async def send_message(self, message: str, dedupe_window_seconds: int = 300):
         if not self.token or not self.chat_id:
             logger.info("Telegram token or chat_id not configured")
             return
 
         # Deduplication
-        msg_hash = hashlib.md5(message.encode()).hexdigest()
+        msg_hash = hashlib.blake2b(message.encode(), digest_size=16).hexdigest()
         now = datetime.now(timezone.utc)
         
-        if msg_hash in self._cache:
-            last_sent = self._cache[msg_hash]
-            if now - last_sent < timedelta(seconds=dedupe_window_seconds):
-                logger.info("Skipping duplicate notification")
-                return
+        last_sent = self._cache.get(msg_hash)
+        if last_sent is not None and now - last_sent < timedelta(seconds=dedupe_window_seconds):
+            logger.info("Skipping duplicate notification")
+            return
         
         self._cache[msg_hash] = now
-        
-        # TODO Cleanup cache if too big? For now simple dict.
+        self._cache.move_to_end(msg_hash)
+        # Bounded: drop the least recently sent messages
+        while len(self._cache) > self.DEDUPE_CACHE_SIZE:
+            self._cache.popitem(last=False)
 
-        url = f"{self.BASE_URL}{self.token}/sendMessage"
+        url = f"/bot{self.token}/sendMessage"
         payload = {
             "chat_id": self.chat_id,
             "text": message,
             "parse_mode": "Markdown"
         }
         
-        async with httpx.AsyncClient() as client:
+        async with self._send_semaphore:
             try:
-                response = await client.post(url, json=payload)
+                response = await self._get_client().post(url, json=payload)
                 response.raise_for_status()
             except Exception as e:
                 logger.error(f"Failed to send telegram message: {e}")
@@ -1,63 +1,124 @@
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from app.db.session import AsyncSessionLocal
+from app.db.session import SchedulerSessionLocal
 from app.services.ingester import DataIngester
 from app.services.the_odds_api import TheOddsAPIClient
 from app.services.standardizer import DataStandardizer
 from app.repositories.mapping import MappingRepository
 from app.db.models import Preset, PresetHiddenItem, Bet, Bookmaker, Event, Odds, Market, League
-from sqlalchemy import select, delete, update, and_, or_
+from sqlalchemy import select, delete, update, and_, or_, func, case, values, column, bindparam, String, Integer, Float
 from datetime import datetime, timezone, timedelta
+from typing import Optional
 from app.core.config import settings
 from app.services.analysis import OddsAnalysisService
 from app.services.bookmakers.base import BookmakerFactory
-from sqlalchemy.orm import selectinload
 from app.services.analytics.trade_finder import TradeFinderService
 from app.services.analytics.trade_finder import TradeFinderService
 from app.core.enums import BetResult, BetStatus
 from app.services.notifications.manager import NotificationManager
+from app.services.auto_trade import AutoTradeService
+from app.services.connection_manager import manager as connection_manager
+import asyncio
 import logging
 logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler(timezone=timezone.utc)
 
-async def job_heartbeat():
-    logger.debug(f"Scheduler Heartbeat: {datetime.now(timezone.utc)}")
+# Markets synced for presets that don't pick any
+_DEFAULT_MARKETS = frozenset({"h2h", "spreads", "totals"})
 
-async def job_fetch_sports():
-    async with AsyncSessionLocal() as db:
+# Max concurrent bookmaker balance requests when settling bets
+BALANCE_FETCH_CONCURRENCY = 8
+
+# Shared across job runs, so the ingester's lookup caches and HTTP pools persist between syncs
+_ingester: Optional[DataIngester] = None
+
+def get_ingester() -> DataIngester:
+    global _ingester
+    if _ingester is None:
         # Manually instantiate dependencies since we are outside request context
         client = TheOddsAPIClient()
         mapping_repo = MappingRepository()
         standardizer = DataStandardizer(mapping_repo)
-        ingester = DataIngester(client, standardizer)
-        
-        await ingester.sync_sports(db)
+        _ingester = DataIngester(client, standardizer)
+    return _ingester
+
+# Statements run on every tick, built once at import (parameters are bound per execution)
+_DUE_PRESETS_STMT = select(Preset).where(
+    Preset.active == True,
+    or_(
+        Preset.last_sync_at == None,
+        Preset.last_sync_at < bindparam("cutoff")
+    )
+)
+_ACTIVE_API_BOOKMAKERS_STMT = select(Bookmaker).where(Bookmaker.active == True, Bookmaker.model_type == 'api')
+# Past events still missing a result from the results bookmaker (ids only)
+_RESULT_EVENTS_STMT = (
+    select(Event.id)
+    .join(Market, Event.id == Market.event_id)
+    .join(Odds, Market.id == Odds.market_id)
+    .where(
+        Odds.bookmaker_id == bindparam("bookmaker_id"),
+        Odds.result == None,
+        Event.commence_time < bindparam("cutoff"),
+        Event.commence_time > bindparam("window_start")
+    )
+    .distinct()
+)
+# Open bets on events that started before start_cutoff
+_SETTLEMENT_BET_FILTERS = (
+    Bet.status.in_(["pending", "open", "placed", "manual", "auto"]),
+    Event.commence_time < bindparam("start_cutoff"),
+    Event.commence_time > bindparam("window_start")
+)
+# Only the columns settlement needs (plain rows, no ORM hydration); streamed with yield_per
+_SETTLEMENT_BETS_STMT = (
+    select(Bet.id, Bet.stake, Bet.price, Bet.status, Bet.bookmaker_id)
+    .join(Event)
+    .where(*_SETTLEMENT_BET_FILTERS)
+    .execution_options(yield_per=200)
+)
+# Result of each of those bets: joined to the resulted odds of its (event, market, selection)
+_SETTLEMENT_OUTCOMES_STMT = (
+    select(Bet.id, Odds.result)
+    .join(Event, Event.id == Bet.event_id)
+    .join(Market, and_(
+        Market.event_id == Bet.event_id,
+        Market.key == Bet.market_key
+    ))
+    .join(Odds, and_(
+        Odds.market_id == Market.id,
+        Odds.normalized_selection == Bet.selection,
+        Odds.result.is_not(None)
+    ))
+    .where(*_SETTLEMENT_BET_FILTERS)
+    .distinct()
+)
+
+async def job_heartbeat():
+    logger.debug(f"Scheduler Heartbeat: {datetime.now(timezone.utc)}")
+
+async def job_fetch_sports():
+    async with SchedulerSessionLocal() as db:
+        await get_ingester().sync_sports(db)
 
 
 
 async def job_analyze_odds():
-    async with AsyncSessionLocal() as db:
+    async with SchedulerSessionLocal() as db:
         await OddsAnalysisService.calculate_benchmark_values(db)
 
 async def job_preset_sync():
     
     logger.info("Starting scheduled Preset Data Sync job...")
     
-    async with AsyncSessionLocal() as db:
+    async with SchedulerSessionLocal() as db:
         # Optimization: Filter due presets in SQL
         now = datetime.now(timezone.utc)
         interval = timedelta(hours=settings.PRESET_SYNC_INTERVAL_HOURS)
         cutoff = now - interval
         
-        stmt = select(Preset).where(
-            Preset.active == True,
-            or_(
-                Preset.last_sync_at == None,
-                Preset.last_sync_at < cutoff
-            )
-        )
-        result = await db.execute(stmt)
+        result = await db.execute(_DUE_PRESETS_STMT, {"cutoff": cutoff})
         presets = result.scalars().all()
         
         if not presets:
@@ -66,18 +127,34 @@ async def job_preset_sync():
 
         logger.info(f"Found {len(presets)} presets due for sync.")
 
-        # Optimization: Instantiate dependencies ONCE
-        client = TheOddsAPIClient()
-        mapping_repo = MappingRepository()
-        standardizer = DataStandardizer(mapping_repo)
-        ingester = DataIngester(client, standardizer)
+        # Optimization: Dependencies are shared across presets and job runs
+        ingester = get_ingester()
         
         # Fetch active Bookmakers ONCE
-        bk_res = await db.execute(select(Bookmaker).where(Bookmaker.active == True, Bookmaker.model_type == 'api'))
+        bk_res = await db.execute(_ACTIVE_API_BOOKMAKERS_STMT)
         active_bookmakers = bk_res.scalars().all()
         
+        # Popular leagues for every sport of presets that want them, in one query
+        # Map: sport_key -> [league_key]
+        popular_sports = {
+            sport_key
+            for preset in presets if preset.sports and preset.show_popular_leagues
+            for sport_key in preset.sports
+        }
+        popular_leagues_by_sport = {}
+        if popular_sports:
+            pop_res = await db.execute(
+                select(League.sport_key, League.key).where(
+                    League.sport_key.in_(popular_sports),
+                    League.popular == True,
+                    League.active == True
+                )
+            )
+            for sport_key, league_key in pop_res.all():
+                popular_leagues_by_sport.setdefault(sport_key, []).append(league_key)
+        
         # --- Aggregation Phase ---
-        # Map: league_key -> { 'presets': [Preset], 'markets': set() }
+        # Map: league_key -> { 'presets': [Preset], 'preset_names': set(), 'markets': set() }
         league_map = {}
         
         for preset in presets:
@@ -100,49 +177,48 @@ async def job_preset_sync():
                 # Preset wants popular leagues for sport. Ignore leagues list.
                 leagues = []
                 logger.info(f"Preset {preset.name} has sports but no leagues. Fetching popular leagues...")
-                # Fetch popular leagues for these sports
-                # We need to query the League table
-                # We can cache this or query per preset. Querying is safer.
-                
-                # We need a synchronous-style query execution here or just await
-                # preset.sports is a list of sport keys
-                
-                # We need to handle this efficiently. multiple presets might need this.
-                # But let's do it simple first.
-                stmt_pop = select(League.key).where(
-                    League.sport_key.in_(preset.sports),
-                    League.popular == True,
-                    League.active == True
-                )
-                pop_res = await db.execute(stmt_pop)
-                pop_leagues = pop_res.scalars().all()
+                # Popular leagues for these sports (preloaded above for all presets)
+                pop_leagues = [
+                    league_key
+                    for sport_key in dict.fromkeys(preset.sports)
+                    for league_key in popular_leagues_by_sport.get(sport_key, [])
+                ]
                 
                 if pop_leagues:
-                    leagues = list(pop_leagues)
+                    leagues = pop_leagues
                     logger.info(f"  -> Added {len(leagues)} popular leagues for preset {preset.name}")
                 else:
                     logger.debug(f"  -> No popular leagues found for sports: {preset.sports}")
             
             # Determine markets
-            p_markets = set(preset.markets) if preset.markets else {"h2h", "spreads", "totals"}
+            p_markets = frozenset(preset.markets) if preset.markets else _DEFAULT_MARKETS
             
             for league_key in leagues:
                 if league_key not in league_map:
                     league_map[league_key] = {
                         'presets': [],
+                        'preset_names': set(),
                         'markets': set()
                     }
                 league_map[league_key]['presets'].append(preset)
-                league_map[league_key]['markets'].update(p_markets)
+                league_map[league_key]['preset_names'].add(preset.name)
+                league_map[league_key]['markets'] |= p_markets
         
         # --- Execution Phase ---
         synced_any = False
+        # Presets with at least one successfully synced league
+        synced_preset_ids = set()
+        
+        league_markets = {
+            league_key: ",".join(data['markets']) for league_key, data in league_map.items()
+        }
+        # TheOddsAPI requests for all leagues run concurrently up front (HTTP only);
+        # each league is then processed sequentially on the shared session.
+        toa_payloads = await ingester.prefetch_league_odds(league_markets, active_bookmakers)
         
         for league_key, data in league_map.items():
-            combined_markets = list(data['markets'])
-            markets_str = ",".join(combined_markets)
+            markets_str = league_markets[league_key]
             associated_presets = data['presets']
-            preset_names = [p.name for p in associated_presets]
             
             try:
                 # Sync League (One Request)
@@ -151,16 +227,12 @@ async def job_preset_sync():
                     league_key=league_key, 
                     markets=markets_str, 
                     active_bookmakers=active_bookmakers,
-                    preset_names=preset_names
+                    preset_names=data['preset_names'],
+                    toa_raw=toa_payloads[league_key]
                 )
                 
-                # Update last_sync_at for all associated presets
-                # We do this individually to be safe, but can commit in batch
-                for p in associated_presets:
-                    p.last_sync_at = datetime.now(timezone.utc)
-                    db.add(p)
-                
-                await db.commit()
+                # last_sync_at is set for all associated presets after the loop, in one commit
+                synced_preset_ids.update(p.id for p in associated_presets)
                 synced_any = True
                 
             except Exception as e:
@@ -172,6 +244,19 @@ async def job_preset_sync():
                 # But we should continue to next league.
                 pass
 
+        # Update last_sync_at for all synced presets (single UPDATE and commit)
+        # Stamped with the tick's start time, the same clock the due-preset cutoff uses
+        if synced_preset_ids:
+            try:
+                await db.execute(
+                    update(Preset)
+                    .where(Preset.id.in_(synced_preset_ids))
+                    .values(last_sync_at=now)
+                )
+                await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to update preset sync times: {e}")
+
         if synced_any:
             logger.info("New data fetched, triggering analysis...")
             await OddsAnalysisService.calculate_benchmark_values(db)
@@ -186,30 +271,36 @@ async def job_preset_sync():
             # But simpler: just check all 'presets' we loaded initially.
             
             try:
-                for preset_obj in presets:
-                    # Reload to get fresh state if needed, though mostly config we need
-                    preset = await db.get(Preset, preset_obj.id)
-                    if not preset: continue
-                    
+                # (preset, opportunities) to notify; sent as one batch below
+                pending_notifications = []
+                # Presets are still attached to the session, no reload needed
+                notif_presets = [
+                    p for p in presets
+                    if (p.other_config or {}).get("notification_new_bet", "true") == "true"
+                ]
+                trade_finder = TradeFinderService()
+                for preset in notif_presets:
                     # Only check if it was actually synced?
                     # If we failed to sync its league, we probably shouldn't notify?
                     # But checking opportunities is harmless (just won't find new ones if no data).
+                    opportunities = await trade_finder.scan_opportunities(db, preset.id)
                     
-                    notif_enabled = preset.other_config.get("notification_new_bet", "true")
-                    if notif_enabled == "true":
-                        trade_finder = TradeFinderService()
-                        opportunities = await trade_finder.scan_opportunities(db, preset.id)
-                        
-                        if opportunities:
-                            logger.info(f"Found {len(opportunities)} potential trades for preset {preset.name}")
-                            notification_manager = NotificationManager(db)
-                            for opp in opportunities:
-                                await notification_manager.send_trade_notification(preset, opp)
+                    if opportunities:
+                        logger.info(f"Found {len(opportunities)} potential trades for preset {preset.name}")
+                        pending_notifications.append((preset, opportunities))
+                
+                if pending_notifications:
+                    notification_manager = NotificationManager(db)
+                    await notification_manager.send_trade_batch([
+                        (preset, opp)
+                        for preset, opportunities in pending_notifications
+                        for opp in opportunities
+                    ])
             except Exception as e:
                 logger.error(f"Error in notification phase: {e}")
 
 async def job_cleanup_hidden_items():
-    async with AsyncSessionLocal() as db:
+    async with SchedulerSessionLocal() as db:
         cutoff = datetime.now(timezone.utc) - timedelta(days=1)
         result = await db.execute(delete(PresetHiddenItem).where(PresetHiddenItem.expiry_at < cutoff))
         await db.commit()
@@ -218,9 +309,7 @@ async def job_cleanup_hidden_items():
 
 async def job_auto_trade():
     """Execute auto-trades for presets with auto_trade enabled."""
-    from app.services.auto_trade import AutoTradeService
-    
-    async with AsyncSessionLocal() as db:
+    async with SchedulerSessionLocal() as db:
         try:
             stats = await AutoTradeService.execute_auto_trades(db)
             if stats["bets_placed"] > 0 or stats["errors"] > 0:
@@ -233,7 +322,7 @@ async def job_auto_trade():
 
 async def job_global_odds_live_sync():
     """Update odds for all API bookmakers and future events."""
-    async with AsyncSessionLocal() as db:
+    async with SchedulerSessionLocal() as db:
         try:
             service = TradeFinderService()
             await service.sync_all_api_bookmaker_odds(db)
@@ -246,9 +335,9 @@ async def job_get_results():
     Update the Odds table with these results.
     """
     logger.info("Starting scheduled Get Results job...")
-    async with AsyncSessionLocal() as db:
+    async with SchedulerSessionLocal() as db:
         # 1. Find the bookmaker configured for results
-        result = await db.execute(select(Bookmaker).where(Bookmaker.active == True, Bookmaker.model_type == 'api'))
+        result = await db.execute(_ACTIVE_API_BOOKMAKERS_STMT)
         bookmakers = result.scalars().all()
         
         source_bookie_model = None
@@ -265,20 +354,14 @@ async def job_get_results():
         now = datetime.now(timezone.utc)
         cutoff = now - timedelta(minutes=100)
         
-        stmt = (
-            select(Event)
-            .join(Market, Event.id == Market.event_id)
-            .join(Odds, Market.id == Odds.market_id)
-            .where(
-                Odds.bookmaker_id == source_bookie_model.id,
-                Odds.result == None,
-                Event.commence_time < cutoff,
-                Event.commence_time > now - timedelta(days=7)
-            )
-            .distinct()
+        result = await db.execute(
+            _RESULT_EVENTS_STMT,
+            {
+                "bookmaker_id": source_bookie_model.id,
+                "cutoff": cutoff,
+                "window_start": now - timedelta(days=7)
+            }
         )
-        
-        result = await db.execute(stmt)
         events_to_check = result.scalars().all()
         
         if not events_to_check:
@@ -290,7 +373,7 @@ async def job_get_results():
         service = BookmakerFactory.get_bookmaker(source_bookie_model.key, source_bookie_model.config or {}, db)
         
         # Batch Fetch
-        event_ids = [str(e.id) for e in events_to_check]
+        event_ids = [str(event_id) for event_id in events_to_check]
         try:
             results = await service.get_events_results(event_ids)
             
@@ -300,9 +383,8 @@ async def job_get_results():
 
             logger.info(f"Received {len(results)} result entries. Updating database...")
             
-            # Group updates by event to be cleaner or just bulk update?
-            # We can iterate results and update.
-            count = 0
+            # One row per (event, market, selection); a later entry wins, as with sequential updates
+            result_rows = {}
             for result_item in results:
                 res_status = result_item.get("result") # win, loss, void
                 sel_norm = result_item.get("selection") 
@@ -310,20 +392,53 @@ async def job_get_results():
                 ev_id = result_item.get("event_id") # Internal ID string
                 
                 if res_status and sel_norm and ev_id and mkt_key:
-                    # Update all odds for this event, market, selection
-                    subquery = select(Market.id).where(Market.event_id == ev_id)
-                    subquery = subquery.where(Market.key == mkt_key)
-                        
+                    result_rows[(ev_id, mkt_key, sel_norm)] = res_status
+            
+            count = 0
+            if result_rows:
+                odds_table = Odds.__table__
+                market_table = Market.__table__
+                if db.get_bind().dialect.name == "postgresql":
+                    # Single UPDATE ... FROM market, (VALUES ...) joined on event, market and selection
+                    r = values(
+                        column("event_id", String),
+                        column("market_key", String),
+                        column("selection", String),
+                        column("result", String),
+                        name="r"
+                    ).data([
+                        (ev_id, mkt_key, sel_norm, res_status)
+                        for (ev_id, mkt_key, sel_norm), res_status in result_rows.items()
+                    ])
                     res = await db.execute(
-                        update(Odds)
+                        update(odds_table)
                         .where(
-                            Odds.market_id.in_(subquery),
-                            Odds.normalized_selection == sel_norm
+                            odds_table.c.market_id == market_table.c.id,
+                            market_table.c.event_id == r.c.event_id,
+                            market_table.c.key == r.c.market_key,
+                            odds_table.c.normalized_selection == r.c.selection
                         )
-                        .values(result=res_status)
+                        .values(result=r.c.result)
                     )
-                    count += res.rowcount
-                print(f"Updated Odds with Result:", result_item)
+                    count = res.rowcount
+                else:
+                    # SQLite has no column-aliased VALUES: one executemany of a per-result
+                    # UPDATE odds ... FROM market join (no IN subquery to plan per row)
+                    res = await db.execute(
+                        update(odds_table)
+                        .where(
+                            odds_table.c.market_id == market_table.c.id,
+                            market_table.c.event_id == bindparam("b_event_id"),
+                            market_table.c.key == bindparam("b_market_key"),
+                            odds_table.c.normalized_selection == bindparam("b_selection")
+                        )
+                        .values(result=bindparam("b_result")),
+                        [
+                            {"b_event_id": ev_id, "b_market_key": mkt_key, "b_selection": sel_norm, "b_result": res_status}
+                            for (ev_id, mkt_key, sel_norm), res_status in result_rows.items()
+                        ]
+                    )
+                    count = res.rowcount
             logger.info(f"Updated {count} odds entries with results.")
 
         except Exception as e:
@@ -336,74 +451,37 @@ async def job_settle_bets():
     Settle bets based on results present in the Odds table.
     """
     logger.info("Starting scheduled Bet Settlement job...")
-    async with AsyncSessionLocal() as db:
+    async with SchedulerSessionLocal() as db:
         now = datetime.now(timezone.utc)
         # Look for bets on events that started at least 100 mins ago
         start_cutoff = now - timedelta(minutes=100)
         
-        stmt = (
-             select(Bet)
-             .join(Event)
-             .join(Bookmaker)
-             .options(selectinload(Bet.bookmaker))
-             .where(
-                 Bet.status.in_(["pending", "open", "placed", "manual", "auto"]),
-                 Event.commence_time < start_cutoff,
-                 Event.commence_time > now - timedelta(days=7)
-             )
-        )
-        
-        result = await db.execute(stmt)
-        bets = result.scalars().all()
-        
-        if not bets:
-            logger.info("No bets due for settlement check.")
-            return
-            
-        logger.info(f"Checking settlement for {len(bets)} bets...")
+        bet_params = {"start_cutoff": start_cutoff, "window_start": now - timedelta(days=7)}
 
         # Optimization: Batch fetch results
-        # Collect unique composites (event_id, market_key, normalized_selection)
-        candidates = []
-        for bet in bets:
-             candidates.append((bet.event_id, bet.market_key, bet.selection))
-        
-        if not candidates:
-             return
-
-        # Build a query for all relevant Odds with results
-        # We need to filter by combinations.
-        # Efficient way: WHERE (event_id, market_key, normalized_selection) IN (...) is not standard SQL cross-db.
-        # Safer way: fetch all ODDS with results for these Events and create a map.
-        
-        relevant_event_ids = list(set([b.event_id for b in bets]))
-        
-        odds_stmt = (
-            select(Odds, Market.event_id, Market.key)
-            .join(Market)
-            .where(
-                Market.event_id.in_(relevant_event_ids),
-                Odds.result.is_not(None)
-            )
-        )
-        odds_res = await db.execute(odds_stmt)
-        odds_rows = odds_res.all()
-        
-        # Create Result Map: (event_id, market_key, selection_norm) -> Result
-        result_map = {}
-        for odd, ev_id, mkt_key in odds_rows:
-             key = (ev_id, mkt_key, odd.normalized_selection)
-             result_map[key] = odd.result
+        # One query for the outcome of every due bet. Create Result Map: bet_id -> Result
+        outcome_res = await db.execute(_SETTLEMENT_OUTCOMES_STMT, bet_params)
+        result_map = {bet_id: outcome for bet_id, outcome in outcome_res.all()}
+        if not result_map:
+            # No due bet has a resulted selection yet, so nothing can settle this tick
+            logger.info("No results available for bets due for settlement.")
+            return
 
         # Map bookmaker_id to amount to CREDIT (add) to balance
         bookmakers_credits = {} 
 
+        # bet_id -> settled status/payout, written with one UPDATE below
+        settlements = {}
         total_settled = 0
-        for bet in bets:
+        total_checked = 0
+        # Streamed in batches (yield_per), so bets are not all held in memory at once
+        bets = await db.stream(_SETTLEMENT_BETS_STMT, bet_params)
+        async for bet in bets:
+            total_checked += 1
             try:
                 # Lookup Result
                 # Try exact normalized selection
-                outcome = result_map.get((bet.event_id, bet.market_key, bet.selection))
+                outcome = result_map.get(bet.id)
                 
                 # logger.debug(f"Bet {bet.id} outcome: {outcome}")
 
@@ -424,68 +502,140 @@ async def job_settle_bets():
                     
                     if new_status != bet.status:
                          logger.info(f"Settling bet {bet.id} as {new_status} with payout {payout_val}")
-                         bet.status = new_status
-                         bet.payout = payout_val
-                         bet.settled_at = now
-                         db.add(bet)
+                         settlements[bet.id] = {"status": new_status, "payout": payout_val}
                          
                          total_settled += 1
                          
                          # Track credit for bookmaker balance update
                          if balance_credit > 0:
-                             current = bookmakers_credits.get(bet.bookmaker.id, 0.0)
-                             bookmakers_credits[bet.bookmaker.id] = current + balance_credit
+                             current = bookmakers_credits.get(bet.bookmaker_id, 0.0)
+                             bookmakers_credits[bet.bookmaker_id] = current + balance_credit
                              
             except Exception as e:
                 logger.error(f"Error settling bet {bet.id}: {e}")
         
+        if not total_checked:
+            logger.info("No bets due for settlement check.")
+            return
+        logger.info(f"Checked settlement for {total_checked} bets.")
+        
+        if settlements:
+            # One UPDATE for every settled bet, status/payout picked per id with CASE
+            bet_table = Bet.__table__
+            await db.execute(
+                update(bet_table)
+                .where(bet_table.c.id.in_(settlements))
+                .values(
+                    status=case({bet_id: row["status"] for bet_id, row in settlements.items()}, value=bet_table.c.id),
+                    payout=case({bet_id: row["payout"] for bet_id, row in settlements.items()}, value=bet_table.c.id),
+                    settled_at=now
+                )
+            )
         await db.commit()
         logger.info(f"Settled {total_settled} bets.")
         
         if total_settled > 0:
              # Broadcast update to frontend
              try:
-                 from app.services.connection_manager import manager
-                 await manager.broadcast_my_bets({"type": "bets_updated"})
+                 await connection_manager.broadcast_my_bets({"type": "bets_updated"})
              except Exception as e:
                  logger.error(f"Failed to broadcast bet updates: {e}")
         
         # Update Balances
+        # Only the credited bookmakers are loaded (one query); API balances are fetched concurrently.
+        # The services are bound to no session (db=None) so the gathered coroutines never touch
+        # the job's AsyncSession; circuit breaker alerts they raise are persisted after the gather.
+        bookmakers_by_id = {}
+        if bookmakers_credits:
+            bk_res = await db.execute(select(Bookmaker).where(Bookmaker.id.in_(bookmakers_credits)))
+            bookmakers_by_id = {bk.id: bk for bk in bk_res.scalars()}
+        credited = []
         for bk_id, credit_amount in bookmakers_credits.items():
-            try:
-                # Re-fetch bookmaker to avoid session issues
-                bk = await db.get(Bookmaker, bk_id)
-                if not bk: continue
-                
-                # Check API Balance if API bookmaker
-                # We can do this check safely
-                service = None
-                if bk.model_type == 'api' and bk.config:
-                    try:
-                        service = BookmakerFactory.get_bookmaker(bk.key, bk.config, db)
-                    except:
-                        pass
-                
+            bk = bookmakers_by_id.get(bk_id)
+            if not bk: continue
+            
+            # Check API Balance if API bookmaker
+            # We can do this check safely
+            service = None
+            if bk.model_type == 'api' and bk.config:
+                try:
+                    service = BookmakerFactory.get_bookmaker(bk.key, bk.config, None)
+                except:
+                    pass
+            credited.append((bk, credit_amount, service))
+        
+        semaphore = asyncio.Semaphore(BALANCE_FETCH_CONCURRENCY)
+        
+        async def fetch_balance(service):
+            if not service:
+                return None
+            async with semaphore:
+                bal_res = await service.get_account_balance()
+            if bal_res and "balance" in bal_res:
+                return float(bal_res["balance"])
+            return None
+        
+        api_balances = await asyncio.gather(
+            *(fetch_balance(service) for _, _, service in credited),
+            return_exceptions=True
+        )
+        
+        for _, _, service in credited:
+            alerts = getattr(service, "pending_alerts", None)
+            while alerts:
+                title, message = alerts.pop(0)
+                try:
+                    await NotificationManager(db).send_error_notification(title, message)
+                except Exception as e:
+                    logger.error(f"Failed to send circuit breaker notification: {e}")
+        
+        # API balances are set as reported; the rest are credited in SQL (balance + credit)
+        balance_rows = []
+        credit_rows = []
+        for (bk, credit_amount, _), api_balance in zip(credited, api_balances):
+            if isinstance(api_balance, Exception):
                 api_balance = None
-                if service:
-                    try:
-                        bal_res = await service.get_account_balance()
-                        if bal_res and "balance" in bal_res:
-                            api_balance = float(bal_res["balance"])
-                    except Exception:
-                        pass
-                
-                if api_balance is not None:
-                     bk.balance = api_balance
-                     logger.info(f"Updated balance for {bk.title} from API: {bk.balance}")
+            
+            if api_balance is not None:
+                 balance_rows.append({"b_id": bk.id, "b_balance": api_balance})
+                 logger.info(f"Updated balance for {bk.title} from API: {api_balance}")
+            else:
+                 # Manual Update
+                 credit_rows.append({"b_id": bk.id, "b_credit": credit_amount})
+                 logger.info(f"Updated balance for {bk.title} via calculation: +{credit_amount}")
+        
+        try:
+            bookmaker_table = Bookmaker.__table__
+            if balance_rows:
+                await db.execute(
+                    update(bookmaker_table)
+                    .where(bookmaker_table.c.id == bindparam("b_id"))
+                    .values(balance=bindparam("b_balance")),
+                    balance_rows
+                )
+            if credit_rows:
+                if db.get_bind().dialect.name == "postgresql":
+                    # Single UPDATE ... FROM (VALUES (id, credit), ...)
+                    v = values(
+                        column("id", Integer),
+                        column("credit", Float),
+                        name="v"
+                    ).data([(row["b_id"], row["b_credit"]) for row in credit_rows])
+                    await db.execute(
+                        update(bookmaker_table)
+                        .where(bookmaker_table.c.id == v.c.id)
+                        .values(balance=func.coalesce(bookmaker_table.c.balance, 0) + v.c.credit)
+                    )
                 else:
-                     # Manual Update
-                     bk.balance += credit_amount
-                     logger.info(f"Updated balance for {bk.title} via calculation: +{credit_amount} (New: {bk.balance})")
-                
-                db.add(bk)
-            except Exception as e:
-                logger.error(f"Failed to update balance for bookmaker {bk_id}: {e}")
+                    # SQLite has no column-aliased VALUES: one executemany
+                    await db.execute(
+                        update(bookmaker_table)
+                        .where(bookmaker_table.c.id == bindparam("b_id"))
+                        .values(balance=func.coalesce(bookmaker_table.c.balance, 0) + bindparam("b_credit")),
+                        credit_rows
+                    )
+        except Exception as e:
+            logger.error(f"Failed to update bookmaker balances: {e}")
         
         await db.commit()
 
@@ -41,70 +41,75 @@ class StakeCalculator:
         Returns:
             Calculated stake amount
         """
-        stake = 0.0
-        
-        if strategy == "fixed":
-            stake = default_stake or 10.0
-            
-        elif strategy == "risk":
-            if percent_risk is None:
-                logger.warning("Percent risk not provided for 'risk' strategy, using 10%")
-                percent_risk = 10.0
-            
-            # Calculate stake as percentage of bankroll
-            stake = bankroll * (percent_risk / 100.0)
-            
-        elif strategy == "kelly":
-            if probability is None or odds is None:
-                logger.error("Probability and odds are required for Kelly strategy, falling back to fixed")
-                stake = default_stake or 10.0
-            else:
-                if kelly_multiplier is None:
-                    logger.warning("Kelly multiplier not provided, using 1.0")
-                    kelly_multiplier = 1.0
-                
-                # Kelly Criterion: f = (bp - q) / b
-                # where:
-                #   f = fraction of bankroll to bet
-                #   b = decimal odds - 1 (net odds)
-                #   p = probability of winning
-                #   q = probability of losing (1 - p)
-                
-                b = odds - 1.0  # Net odds
-                p = probability
-                q = 1.0 - p
-                
-                # Calculate Kelly fraction
-                kelly_fraction = (b * p - q) / b
-                
-                # Apply multiplier to reduce volatility
-                kelly_fraction = kelly_fraction * kelly_multiplier
-                
-                # Kelly fraction should be between 0 and 1
-                # Negative kelly means no edge, don't bet
-                if kelly_fraction <= 0:
-                    logger.debug(f"Kelly fraction is {kelly_fraction:.4f} (negative or zero), setting stake to minimum")
-                    stake = 0.0
-                elif kelly_fraction > 1:
-                    logger.debug(f"Kelly fraction is {kelly_fraction:.4f} (>1), capping at 1.0")
-                    kelly_fraction = 1.0
-                    stake = bankroll * kelly_fraction
-                else:
-                    stake = bankroll * kelly_fraction
-        else:
+        stake_fn = _STRATEGIES.get(strategy)
+        if stake_fn is None:
             logger.error(f"Unknown staking strategy: {strategy}, using fixed")
-            stake = default_stake or 10.0
+            stake_fn = _fixed_stake
+        stake = stake_fn(default_stake, bankroll, probability, odds, percent_risk, kelly_multiplier)
         
-        # Apply max stake cap if provided
-        if max_stake is not None and stake > max_stake:
-            logger.info(f"Calculated stake {stake:.2f} exceeds max_stake {max_stake:.2f}, capping at max")
-            stake = max_stake
+        # Ensure stake is at least 0, then work in whole cents (rounded half up)
+        stake_cents = _to_cents(max(0.0, stake))
         
-        # Ensure stake is at least 0
-        stake = max(0.0, stake)
+        # Apply max stake cap if provided
+        if max_stake is not None:
+            max_cents = _to_cents(max(0.0, max_stake))
+            if stake_cents > max_cents:
+                logger.info(f"Calculated stake {stake:.2f} exceeds max_stake {max_stake:.2f}, capping at max")
+                stake_cents = max_cents
         
-        # Round to 2 decimal places
-        stake = round(stake, 2)
+        stake = stake_cents / 100.0
         
-        logger.debug(f"Calculated stake: {stake:.2f} using strategy '{strategy}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Calculated stake: {stake:.2f} using strategy '{strategy}'")
         return stake
+
+
+def _to_cents(amount: float) -> int:
+    """Non-negative amount to whole cents, rounding half up."""
+    return int(amount * 100 + 0.5)
+
+
+def _fixed_stake(default_stake, bankroll, probability, odds, percent_risk, kelly_multiplier) -> float:
+    return default_stake or 10.0
+
+
+def _risk_stake(default_stake, bankroll, probability, odds, percent_risk, kelly_multiplier) -> float:
+    if percent_risk is None:
+        logger.warning("Percent risk not provided for 'risk' strategy, using 10%")
+        percent_risk = 10.0
+    
+    # Calculate stake as percentage of bankroll
+    return bankroll * (percent_risk / 100.0)
+
+
+def _kelly_stake(default_stake, bankroll, probability, odds, percent_risk, kelly_multiplier) -> float:
+    if probability is None or odds is None:
+        logger.error("Probability and odds are required for Kelly strategy, falling back to fixed")
+        return default_stake or 10.0
+    if kelly_multiplier is None:
+        logger.warning("Kelly multiplier not provided, using 1.0")
+        kelly_multiplier = 1.0
+    
+    # Kelly Criterion: f = (bp - q) / b = (odds * p - 1) / b
+    # where:
+    #   f = fraction of bankroll to bet
+    #   b = decimal odds - 1 (net odds)
+    #   p = probability of winning
+    #   q = probability of losing (1 - p)
+    b = odds - 1.0  # Net odds
+    if b <= 0:
+        # No possible return, don't bet
+        return 0.0
+    
+    # Apply multiplier to reduce volatility, then clamp to [0, 1]
+    # (negative kelly means no edge, don't bet)
+    kelly_fraction = max(0.0, min(1.0, (odds * probability - 1.0) / b * kelly_multiplier))
+    return bankroll * kelly_fraction
+
+
+# Strategy name -> stake function, resolved once at import
+_STRATEGIES = {
+    "fixed": _fixed_stake,
+    "risk": _risk_stake,
+    "kelly": _kelly_stake,
+}
@@ -1,28 +1,164 @@
 
-from typing import Optional
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.mapping import MappingRepository
 
+# Generic H2H / Match Winner patterns: lowercased selection -> internal key
+_FALLBACK_SELECTIONS = {
+    **dict.fromkeys(("home", "1", "team 1", "team1"), "home"),
+    **dict.fromkeys(("away", "2", "team 2", "team2"), "away"),
+    **dict.fromkeys(("draw", "x", "the draw"), "draw"),
+}
+# Markets whose selections are team names
+_TEAM_MARKETS = frozenset({"h2h", "spreads"})
+
+
+@lru_cache(maxsize=8192)
+def _normalize_selection(
+    external_key: str, home_team: Optional[str], away_team: Optional[str], market_key: Optional[str]
+) -> str:
+    """Pure selection fallback; the same few names repeat across every bookmaker and market."""
+    val = external_key.lower().strip()
+    
+    # First, check if we have event context for home/away team matching
+    # For H2H and spreads markets, match team names
+    if market_key in _TEAM_MARKETS:
+        # Exact match (case-insensitive)
+        if val == home_team.strip().lower():
+            return "home"
+        if val == away_team.strip().lower():
+            return "away"
+    
+    generic = _FALLBACK_SELECTIONS.get(val)
+    if generic: return generic
+    
+    # Totals
+    if val.startswith("over"): return "over"
+    if val.startswith("under"): return "under"
+    
+    # If no match found, return original (this handles team names that couldn't be matched)
+    return external_key
+
+
 class DataStandardizer:
+    # Seconds a cached mapping lookup (hit or miss) stays valid
+    MAPPING_CACHE_TTL = 300
+    MAPPING_CACHE_MAX_SIZE = 50_000
+
     def __init__(self, mapping_repo: MappingRepository):
         self.mapping_repo = mapping_repo
+        # In-process TTL cache: (source, type, external_key) -> (internal key or None, expires_at)
+        self._cache: Dict[Tuple[str, str, str], tuple] = {}
+
+    def _cache_get(self, key: Tuple[str, str, str]) -> Tuple[bool, Optional[str]]:
+        """Return (found, internal key); found is False if missing/expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if time.monotonic() > expires_at:
+            del self._cache[key]
+            return False, None
+        return True, value
+
+    def _cache_set(self, key: Tuple[str, str, str], value: Optional[str]):
+        if len(self._cache) >= self.MAPPING_CACHE_MAX_SIZE:
+            self._cache.clear()
+        self._cache[key] = (value, time.monotonic() + self.MAPPING_CACHE_TTL)
+
+    async def _get_internal_keys(
+        self, db: AsyncSession, triples: Iterable[Tuple[str, str, str]]
+    ) -> Dict[Tuple[str, str, str], Optional[str]]:
+        """Cached mapping lookup; keys not in the cache are resolved with one query."""
+        resolved = {}
+        missing = set()
+        for key in triples:
+            if key in resolved or key in missing:
+                continue
+            found, value = self._cache_get(key)
+            if found:
+                resolved[key] = value
+            else:
+                missing.add(key)
+        if missing:
+            mapped = await self.mapping_repo.get_internal_keys_bulk(db, missing)
+            for key in missing:
+                # Misses are cached too, so unmapped names don't query again every sync
+                resolved[key] = mapped.get(key)
+                self._cache_set(key, resolved[key])
+        return resolved
 
     async def standardize(
         self, db: AsyncSession, source: str, type: str, external_key: str, context: Optional[dict] = None
     ) -> str:
         """
         Convert external key to internal key.
-        If no mapping exists, returns the external key (or could log missing mapping).
+        Keys the default normalization resolves (home/away/draw, over/under, the event's
+        team names) are returned without a lookup; otherwise the DB mapping is used and,
+        if no mapping exists, the external key is returned unchanged.
         Context can include event details like home_team, away_team for better normalization.
         """
-        internal_key = await self.mapping_repo.get_internal_key(
-            db, source, type, external_key
+        candidate = self._default_normalize(type, external_key, context)
+        if candidate != external_key:
+            return candidate
+
+        key = (source, type, external_key)
+        found, internal_key = self._cache_get(key)
+        if not found:
+            internal_key = await self.mapping_repo.get_internal_key(
+                db, source, type, external_key
+            )
+            self._cache_set(key, internal_key)
+        return internal_key or external_key
+
+    async def standardize_batch(
+        self,
+        db: AsyncSession,
+        source: str,
+        type: str,
+        external_keys: List[str],
+        contexts: Optional[List[Optional[dict]]] = None
+    ) -> List[str]:
+        """
+        Batch version of standardize: resolves all keys of one source with a single
+        mapping query. Returns the internal keys in the same order as external_keys.
+        """
+        return await self.standardize_bulk(
+            db, type, [(source, external_key) for external_key in external_keys], contexts=contexts
         )
-        if internal_key:
-            return internal_key
-        
-        # Fallback to default normalization logic if no DB mapping exists
-        return self._default_normalize(type, external_key, context)
+
+    async def standardize_bulk(
+        self,
+        db: AsyncSession,
+        type: str,
+        keys: List[Tuple[str, str]],
+        contexts: Optional[List[Optional[dict]]] = None
+    ) -> List[str]:
+        """
+        Like standardize_batch, but for (source, external_key) pairs spanning several
+        sources: one mapping query in total instead of one per source.
+        """
+        if contexts is None:
+            contexts = [None] * len(keys)
+        # Default normalization first; only keys it leaves unchanged need a mapping lookup
+        results = [
+            self._default_normalize(type, external_key, context)
+            for (_, external_key), context in zip(keys, contexts)
+        ]
+        unresolved = [
+            i for i, ((_, external_key), result) in enumerate(zip(keys, results))
+            if result == external_key
+        ]
+        if unresolved:
+            mapped = await self._get_internal_keys(
+                db, [(keys[i][0], type, keys[i][1]) for i in unresolved]
+            )
+            for i in unresolved:
+                source, external_key = keys[i]
+                results[i] = mapped[(source, type, external_key)] or external_key
+        return results
 
     def _default_normalize(self, type: str, external_key: str, context: Optional[dict] = None) -> str:
         """
@@ -31,34 +167,14 @@ class DataStandardizer:
         """
         if type != "selection":
             return external_key
-            
-        val = external_key.lower().strip()
-        
-        # First, check if we have event context for home/away team matching
-        if context:
-            home_team = context.get("home_team", "").strip()
-            away_team = context.get("away_team", "").strip()
-            market_key = context.get("market_key", "")
-            
-            # For H2H and spreads markets, match team names
-            if market_key in ["h2h", "spreads"]:
-                # Exact match (case-insensitive)
-                if external_key.strip().lower() == home_team.lower():
-                    return "home"
-                if external_key.strip().lower() == away_team.lower():
-                    return "away"
-        
-        # Generic H2H / Match Winner patterns
-        if val in ["home", "1", "team 1", "team1"]: return "home"
-        if val in ["away", "2", "team 2", "team2"]: return "away"
-        if val in ["draw", "x", "the draw"]: return "draw"
-        
-        # Totals
-        if val.startswith("over"): return "over"
-        if val.startswith("under"): return "under"
-        
-        # If no match found, return original (this handles team names that couldn't be matched)
-        return external_key
+        if not context:
+            return _normalize_selection(external_key, None, None, None)
+        return _normalize_selection(
+            external_key,
+            context.get("home_team", ""),
+            context.get("away_team", ""),
+            context.get("market_key", "")
+        )
 
     async def learn_mapping(
         self, db: AsyncSession, source: str, type: str, external_key: str, internal_key: str
@@ -68,6 +184,8 @@ class DataStandardizer:
         """
         # Check if exists first
         existing = await self.mapping_repo.get_internal_key(db, source, type, external_key)
+        # Drop any cached lookup (typically a cached miss) so the new mapping is used right away
+        self._cache.pop((source, type, external_key), None)
         if not existing:
             await self.mapping_repo.create(
                 db, 
@@ -1,5 +1,6 @@
 
 import httpx
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
 import logging
@@ -11,17 +12,61 @@ from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.standardizer import DataStandardizer
 
+try:
+    # Optional HTTP/2 support for httpx (pip install "betfinder[speedups]")
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+try:
+    # Optional fast JSON parser for the (multi-MB) odds payloads (pip install "betfinder[speedups]")
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """ISO 8601 timestamp to datetime, memoized (the same timestamps repeat across events and bookmakers)."""
+    # fromisoformat accepts the trailing "Z" natively (Python 3.11+)
+    return datetime.fromisoformat(value)
+
+
 class TheOddsAPIClient:
     BASE_URL = "https://api.the-odds-api.com/v4"
+    _client: Optional[httpx.AsyncClient] = None # Shared, connection-pooled across instances and scheduler runs
 
     def __init__(self, api_key: str = settings.THE_ODDS_API_KEY):
         self.api_key = api_key
 
-    async def _get(self, endpoint: str, params: Dict[str, Any] = {}) -> Any:
-        params["apiKey"] = self.api_key
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.BASE_URL}{endpoint}", params=params)
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                base_url=cls.BASE_URL,
+                http2=_HTTP2_AVAILABLE, # League fetches are multiplexed over one connection
+                timeout=30,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return cls._client
+
+    @classmethod
+    async def aclose(cls):
+        """Closes the shared client (app shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        # Never mutate the caller's dict (or a shared default): build the query per call
+        query = {"apiKey": self.api_key}
+        if params:
+            query.update(params)
+        # Streamed into one growing buffer: multi-MB odds payloads are not held
+        # as a list of chunks plus a joined copy before parsing
+        async with self._get_client().stream("GET", endpoint, params=query) as response:
             if response.status_code >= 400:
+                await response.aread()
                 try:
                     error_data = response.json()
                     message = error_data.get("message", response.text)
@@ -33,8 +78,11 @@ class TheOddsAPIClient:
                 
                 logger.error(f"TheOddsAPI Error {response.status_code}: {message}")
                 raise Exception(f"TheOddsAPI Error {response.status_code}: {message}")
-                
-            return response.json()
+            
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+        return _json_loads(body)
 
     async def get_sports(self) -> List[OddsSport]:
         """
@@ -67,6 +115,31 @@ class TheOddsAPIClient:
         """
         Returns a list of upcoming events and their odds for a given sport.
         """
+        raw_data = await self.fetch_odds_raw(
+            sport_key=sport_key,
+            regions=regions,
+            markets=markets,
+            bookmakers=bookmakers,
+            commence_from=commence_from,
+            commence_to=commence_to,
+            event_ids=event_ids
+        )
+        return await self.build_odds_events(raw_data, standardizer=standardizer, db=db)
+
+    async def fetch_odds_raw(
+        self, 
+        sport_key: str = "upcoming", 
+        regions: str = settings.THE_ODDS_API_REGIONS, 
+        markets: str = "h2h",
+        bookmakers: Optional[str] = None,
+        commence_from: Optional[str] = None,
+        commence_to: Optional[str] = None,
+        event_ids: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches the raw odds payload for a given sport.
+        Performs no DB access, so several calls can safely run concurrently.
+        """
         params = {
             "regions": regions,
             "markets": markets,
@@ -78,7 +151,8 @@ class TheOddsAPIClient:
             "includeRotationNumbers": True,
         }
         if bookmakers:
-            if "pinnacle" not in bookmakers.lower():
+            # Compare whole keys, so "Pinnacle" isn't added twice and "pinnacle_x" doesn't count
+            if "pinnacle" not in {key.strip().lower() for key in bookmakers.split(",")}:
                 bookmakers = "pinnacle," + bookmakers
             params["bookmakers"] = bookmakers
         if commence_from:
@@ -87,80 +161,116 @@ class TheOddsAPIClient:
             params["commenceTo"] = commence_to
         if event_ids:
             params["eventIds"] = event_ids
-        raw_data = await self._get(f"/sports/{sport_key}/odds", params=params)
-        
+        return await self._get(f"/sports/{sport_key}/odds", params=params)
+
+    async def build_odds_events(
+        self,
+        raw_data: List[Dict[str, Any]],
+        standardizer: Optional[DataStandardizer] = None,
+        db: Optional[AsyncSession] = None
+    ) -> List[OddsEvent]:
+        """
+        Converts a raw odds payload (see fetch_odds_raw) into OddsEvent models,
+        standardizing selection names when a standardizer and db are given.
+        """
         # Convert to Pydantic Models and Standardize
+        # The payload's shape is fixed by the API, so models are built with model_construct
+        # (no per-field validation); prices are the only values coerced explicitly
         odds_events = []
+        # Selections of every bookmaker are standardized in one batch after the payload is built:
+        # [(OddsOutcome, bookmaker key, selection name, context)]
+        pending_selections: List[tuple] = []
+        # Bound to locals: the outcome loop below runs for every outcome of the payload
+        construct_outcome = OddsOutcome.model_construct
+        add_pending = pending_selections.append
         for event in raw_data:
             # Basic Event Info
-            commence_time = datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00"))
+            commence_time = _parse_iso(event["commence_time"])
+            home_team = event["home_team"]
+            away_team = event["away_team"]
             
             bookmakers_list = []
             for b_data in event.get("bookmakers", []):
+                bookmaker_key = b_data["key"]
+                # OddsBookmaker.last_update is required and model_construct doesn't validate:
+                # skip the bookmaker here rather than pass None on to the ingester
+                if not b_data.get("last_update"):
+                    logger.warning(f"Skipping bookmaker '{bookmaker_key}' without last_update for event {event.get('id')}")
+                    continue
+                # Parsed once per bookmaker and shared by its markets
+                last_update = _parse_iso(b_data["last_update"])
                 markets_list = []
                 for m_data in b_data.get("markets", []):
+                    market_key = m_data["key"]
                     # NOTE We skip _lay markets for now, as we expect most users will be backing
-                    if "_lay" in m_data["key"]:
+                    if market_key.endswith("_lay"):
                         continue
 
+                    context = {
+                        "home_team": home_team,
+                        "away_team": away_team,
+                        "market_key": market_key
+                    }
                     outcomes_list = []
+                    add_outcome = outcomes_list.append
                     for outcome in m_data.get("outcomes", []):
                         sel_name = outcome["name"]
-                        norm_name = sel_name # Default
+                        get = outcome.get
                         
-                        if standardizer and db:
-                            # Standardize selection name
-                            norm_name = await standardizer.standardize(
-                                db, b_data["key"], "selection", sel_name,
-                                context={
-                                    "home_team": event["home_team"],
-                                    "away_team": event["away_team"],
-                                    "market_key": m_data["key"]
-                                }
-                            )
-                        
-                        outcomes_list.append(OddsOutcome(
+                        odds_outcome = construct_outcome(
                             selection=sel_name,
-                            normalized_selection=norm_name,
-                            price=outcome["price"],
-                            point=outcome.get("point"),
-                            url=outcome.get("link"),
-                            sid=outcome.get("sid"),
-                            bet_limit=outcome.get("limit")
-                        ))
+                            normalized_selection=sel_name, # Default, standardized below
+                            price=float(outcome["price"]),
+                            point=get("point"),
+                            url=get("link"),
+                            sid=get("sid"),
+                            bet_limit=get("limit")
+                        )
+                        add_outcome(odds_outcome)
+                        add_pending((odds_outcome, bookmaker_key, sel_name, context))
                     
                     if not outcomes_list:
                         continue
 
-                    markets_list.append(OddsMarket(
-                        key=m_data["key"],
+                    markets_list.append(OddsMarket.model_construct(
+                        key=market_key,
                         outcomes=outcomes_list,
                         sid=m_data.get("sid"),
                         link=m_data.get("link"),
-                        last_update=datetime.fromisoformat(b_data["last_update"].replace("Z", "+00:00")) if b_data.get("last_update") else None
+                        last_update=last_update
                     ))
                 
                 if not markets_list:
                     continue
 
-                bookmakers_list.append(OddsBookmaker(
-                    key=b_data["key"],
+                bookmakers_list.append(OddsBookmaker.model_construct(
+                    key=bookmaker_key,
                     title=b_data["title"],
                     markets=markets_list,
-                    last_update=datetime.fromisoformat(b_data["last_update"].replace("Z", "+00:00")),
+                    last_update=last_update,
                     sid=b_data.get("sid"),
                     link=b_data.get("link")
                 ))
 
-            odds_events.append(OddsEvent(
+            odds_events.append(OddsEvent.model_construct(
                 id=event["id"],
                 sport_key=event["sport_key"],
                 sport_title=event["sport_title"],
                 commence_time=commence_time,
-                home_team=event["home_team"],
-                away_team=event["away_team"],
+                home_team=home_team,
+                away_team=away_team,
                 bookmakers=bookmakers_list
             ))
+
+        if standardizer and db and pending_selections:
+            # Standardize selection names (one mapping query for all bookmakers)
+            norm_names = await standardizer.standardize_bulk(
+                db, "selection",
+                [(source, sel_name) for _, source, sel_name, _ in pending_selections],
+                contexts=[context for _, _, _, context in pending_selections]
+            )
+            for (odds_outcome, _, _, _), norm_name in zip(pending_selections, norm_names):
+                odds_outcome.normalized_selection = norm_name
             
         return odds_events
 
@@ -4,23 +4,13 @@ import shutil
 import urllib.request
 import platform
 import sys
+from build_version import get_version
 
 # Constants
 ISCC_URL = "https://files.jrsoftware.org/isno/6.3.3/innosetup-6.3.3.exe"
 INNO_INSTALLER_NAME = "innosetup-installer.exe"
 ISS_SCRIPT_NAME = "betfinder_installer.iss"
 
-def get_version():
-    """Extract version from pyproject.toml."""
-    try:
-        with open("pyproject.toml", "r") as f:
-            for line in f:
-                if line.strip().startswith("version ="):
-                    return line.split("=")[1].strip().strip('"').strip("'")
-    except Exception as e:
-        print(f"Warning: Could not read version from pyproject.toml: {e}")
-    return "0.1.0"
-
 def create_iss_script(version):
     """Create Inno Setup script."""
     
@@ -95,7 +85,7 @@ def build_installer():
         print("Installer build is only supported on Windows.")
         sys.exit(1)
         
-    version = get_version()
+    version = get_version(default="0.1.0")
     
     # 1. Create ISS Script
     iss_file = create_iss_script(version)
@@ -6,6 +6,9 @@ import zipfile
 import subprocess
 import platform
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from build_version import get_version
 
 
 # --- Configuration ---
@@ -23,18 +26,13 @@ UV_PLATFORM_MAP = {
     "Linux": f"https://github.com/astral-sh/uv/releases/download/{UV_VERSION}/uv-x86_64-unknown-linux-gnu.tar.gz"
 }
 
-def get_version():
-    """Extract version from pyproject.toml."""
+def link_or_copy(src, dst):
+    """Hardlink src to dst (no data copied); falls back to a copy across filesystems or where links are unsupported."""
     try:
-        with open("pyproject.toml", "r") as f:
-            # Simple manual parse to avoid depending on toml library if not present in build env
-            # But the user likely has it or we can just parse line by line
-            for line in f:
-                if line.strip().startswith("version ="):
-                    return line.split("=")[1].strip().strip('"').strip("'")
-    except Exception as e:
-        print(f"Warning: Could not read version from pyproject.toml: {e}")
-    return "unknown"
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
 
 def download_uv(target_dir):
     """Download and extract uv executable."""
@@ -80,6 +78,7 @@ def download_uv(target_dir):
         print(f"uv binary ready at {dest}")
         if system != "Windows":
             os.chmod(dest, 0o755)
+        return dest
     else:
         print("Could not find uv binary in downloaded archive.")
         sys.exit(1)
@@ -112,6 +111,12 @@ def build_app():
         except:
              pass
         
+    # uv doesn't depend on the PyInstaller output: download it in the background meanwhile
+    # (the temporary directory is removed after bundling, or at exit if the build fails)
+    uv_download = tempfile.TemporaryDirectory(prefix="uv-")
+    uv_executor = ThreadPoolExecutor(max_workers=1)
+    uv_future = uv_executor.submit(download_uv, uv_download.name)
+
     # 2. PyInstaller Build
     print("Running PyInstaller...")
     
@@ -203,12 +208,17 @@ def build_app():
         src_path = os.path.abspath(item)
         if os.path.exists(src_path):
             if os.path.isdir(src_path):
-                shutil.copytree(src_path, os.path.join(dest_backend, item), dirs_exist_ok=True)
+                shutil.copytree(src_path, os.path.join(dest_backend, item), copy_function=link_or_copy, dirs_exist_ok=True)
             else:
-                shutil.copy2(src_path, os.path.join(dest_backend, item))
+                link_or_copy(src_path, os.path.join(dest_backend, item))
                 
-    # 4. Download and bundle UV
-    download_uv(uv_target_dir)
+    # 4. Bundle UV (downloaded while PyInstaller was running)
+    uv_binary = uv_future.result()
+    uv_executor.shutdown()
+    uv_dest = os.path.join(uv_target_dir, os.path.basename(uv_binary))
+    shutil.move(uv_binary, uv_dest)
+    uv_download.cleanup()
+    print(f"uv bundled at {uv_dest}")
     
     print(f"\nBuild complete! Artifacts are available at:")
     print(f"  {app_output_dir}")
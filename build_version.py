@@ -0,0 +1,11 @@
+import tomllib
+
+
+def get_version(default="unknown"):
+    """Extract version from pyproject.toml."""
+    try:
+        with open("pyproject.toml", "rb") as f:
+            return tomllib.load(f)["project"]["version"]
+    except Exception as e:
+        print(f"Warning: Could not read version from pyproject.toml: {e}")
+    return default
@@ -1,26 +1,45 @@
 import re
 
+# Patterns are compiled once, up front
+CURRENT_PRESET_ID_RE = re.compile(r'let currentPresetId = \{%\s*if first_preset\s*%\}.*?\{%\s*else\s*%\}.*?\{%\s*endif\s*%\};')
+CURRENT_DEFAULT_STAKE_RE = re.compile(r'let currentDefaultStake = \{%\s*if first_preset\s*%\}.*?\{%\s*else\s*%\}.*?\{%\s*endif\s*%\};')
+INITIAL_CONFIG_IF_RE = re.compile(r'const initialConfig = \{%\s*if first_preset\s*%\}.*?\{%\s*else\s*%\}.*?\{%\s*endif\s*%\};')
+INITIAL_CONFIG_RE = re.compile(r'const initialConfig = \{\{.*?\}\};')
+
+# General cleanup of { { -> {{, all variants in a single pass
+BRACE_CLEANUP_RE = re.compile(r'\{\s+\{\s+|\s+\}\s+\}|\{\{  |  \}\}|\{ \{|\} \}')
+BRACE_LITERALS = {
+    "{{  ": "{{ ",
+    "  }}": " }}",
+    "{ {": "{{",
+    "} }": "}}",
+}
+
+def clean_braces(match):
+    text = match.group(0)
+    if text in BRACE_LITERALS:
+        return BRACE_LITERALS[text]
+    # Whitespace-separated braces: "{ { " -> "{{ " and " } }" -> " }}"
+    return "{{ " if text.startswith("{") else " }}"
+
 path = r"d:\Data\git\sportsbetting-group\betfinder\app\web\templates\dashboard.html"
 with open(path, "r", encoding="utf-8") as f:
     content = f.read()
 
 # Fix currentPresetId
-content = re.sub(
-    r'let currentPresetId = \{%\s*if first_preset\s*%\}.*?\{%\s*else\s*%\}.*?\{%\s*endif\s*%\};',
+content = CURRENT_PRESET_ID_RE.sub(
     'let currentPresetId = {% if first_preset %}{{ first_preset.id }}{% else %}null{% endif %};',
     content
 )
 
 # Fix currentDefaultStake
-content = re.sub(
-    r'let currentDefaultStake = \{%\s*if first_preset\s*%\}.*?\{%\s*else\s*%\}.*?\{%\s*endif\s*%\};',
+content = CURRENT_DEFAULT_STAKE_RE.sub(
     'let currentDefaultStake = {% if first_preset %}{{ first_preset.default_stake or 10 }}{% else %}10{% endif %};',
     content
 )
 
 # Fix initialConfig
-content = re.sub(
-    r'const initialConfig = \{%\s*if first_preset\s*%\}.*?\{%\s*else\s*%\}.*?\{%\s*endif\s*%\};',
+content = INITIAL_CONFIG_IF_RE.sub(
     'const initialConfig = {{ (first_preset.other_config or {}) | tojson | safe }};',
     content
 )
@@ -30,19 +49,12 @@ content = re.sub(
 # 220:     const initialConfig = {{ (first_preset.other_config or { }) | tojson | safe }};
 # So just targeting the line content is safer.
 
-content = re.sub(
-    r'const initialConfig = \{\{.*?\}\};',
+content = INITIAL_CONFIG_RE.sub(
     'const initialConfig = {{ (first_preset.other_config or {}) | tojson | safe }};',
     content
 )
 
-# General cleanup of { { -> {{
-content = re.sub(r'\{\s+\{\s+', '{{ ', content)
-content = re.sub(r'\s+\}\s+\}', ' }}', content)
-content = content.replace("{{  ", "{{ ")
-content = content.replace("  }}", " }}")
-content = content.replace("{ {", "{{")
-content = content.replace("} }", "}}")
+content = BRACE_CLEANUP_RE.sub(clean_braces, content)
 
 # Fix specific dict issue
 content = content.replace("or { }", "or {}")
@@ -52,8 +64,7 @@ with open(path, "w", encoding="utf-8") as f:
 
 print(f"Patched {path}")
 
-with open(path, "r", encoding="utf-8") as f:
-    lines = f.readlines()
-    for i, line in enumerate(lines):
-        if "currentPresetId =" in line or "currentDefaultStake =" in line or "initialConfig =" in line:
-            print(f"{i+1}: {line.strip()}")
+# Report from the patched content in memory (no second read of the file)
+for i, line in enumerate(content.splitlines()):
+    if "currentPresetId =" in line or "currentDefaultStake =" in line or "initialConfig =" in line:
+        print(f"{i+1}: {line.strip()}")
@@ -1,10 +1,11 @@
 import asyncio
-from app.db.session import get_db
+import sys
+from app.db.session import AsyncSessionLocal
 from app.db.models import Odds, Bookmaker
 from sqlalchemy import select
 
 async def check_event_sid():
-    async for db in get_db():
+    async with AsyncSessionLocal() as db:
         # Get SX Bet bookmaker ID
         result = await db.execute(select(Bookmaker).where(Bookmaker.key == "sx_bet"))
         sx_bet = result.scalar_one_or_none()
@@ -19,14 +20,17 @@ async def check_event_sid():
         result = await db.execute(
             select(Odds.id, Odds.event_sid, Odds.market_sid, Odds.sid, Odds.bookmaker_id)
             .where(Odds.bookmaker_id == sx_bet.id)
+            # Newest rows first (ordered scan of ix_odds_bookmaker_id)
+            .order_by(Odds.id.desc())
             .limit(10)
         )
         odds = result.all()
         
         print(f"\nFound {len(odds)} SX Bet odds records:")
-        for odd in odds:
-            print(f"  Odds ID: {odd.id}, event_sid: {odd.event_sid}, market_sid: {odd.market_sid}, sid: {odd.sid}")
-        
-        break
+        # One buffered write instead of a print per row
+        sys.stdout.write("".join(
+            f"  Odds ID: {odd.id}, event_sid: {odd.event_sid}, market_sid: {odd.market_sid}, sid: {odd.sid}\n"
+            for odd in odds
+        ))
 
 asyncio.run(check_event_sid())
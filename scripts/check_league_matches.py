@@ -2,20 +2,29 @@ import asyncio
 import sys
 import os
 import difflib
+import re
+from collections import defaultdict
+from operator import itemgetter
 
 sys.path.append(os.getcwd())
 
 from app.db.session import AsyncSessionLocal
-from app.services.bookmakers.sx_bet import SXBetBookmaker
+from app.services.bookmakers.base import BookmakerFactory
+import app.services.bookmakers.implementations  # registers sx_bet with the factory
 from app.db.models import League
 from sqlalchemy import select
 
+def _ratio(s1, s2):
+    """Similarity of two strings in 0.0-1.0, difflib as in app.services.bookmakers.base."""
+    return difflib.SequenceMatcher(None, s1, s2).ratio()
+
 def simple_ratio(s1, s2):
-    return difflib.SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
+    return _ratio(s1.lower(), s2.lower())
+
+_TOKEN_SPLIT_RE = re.compile(r'[^a-zA-Z0-9]+')
 
 def tokenize(s):
-    import re
-    return [t for t in re.split(r'[^a-zA-Z0-9]+', s.lower()) if t]
+    return [t for t in _TOKEN_SPLIT_RE.split(s.lower()) if t]
 
 COUNTRY_SYNONYMS = {
     "dutch": "netherlands",
@@ -32,36 +41,73 @@ COUNTRY_SYNONYMS = {
 }
 
 def normalize_title(s):
-    tokens = tokenize(s)
-    normalized = []
+    # Tokenize and map synonyms in one pass
+    return " ".join([COUNTRY_SYNONYMS.get(t, t) for t in _TOKEN_SPLIT_RE.split(s.lower()) if t])
+
+# Token -> bit position, shared by every title so masks are comparable
+_TOKEN_BITS = {}
+
+def token_mask(tokens):
+    """Bitmask of a token set; two titles share a token iff their masks AND to non-zero."""
+    mask = 0
     for t in tokens:
-        normalized.append(COUNTRY_SYNONYMS.get(t, t))
-    return " ".join(normalized)
+        mask |= 1 << _TOKEN_BITS.setdefault(t, len(_TOKEN_BITS))
+    return mask
+
+def prepare_title(s):
+    """
+    Per-title preprocessing, done once per title rather than once per comparison:
+    (lowercased title, sorted tokens, token set, sorted unique tokens, token bitmask).
+    """
+    tokens = tokenize(normalize_title(s))
+    token_set = set(tokens)
+    return s.lower(), " ".join(sorted(tokens)), token_set, " ".join(sorted(token_set)), token_mask(token_set)
 
 def token_sort_ratio(s1, s2):
-    s1 = normalize_title(s1)
-    s2 = normalize_title(s2)
-    t1 = tokenize(s1)
-    t2 = tokenize(s2)
-    t1.sort()
-    t2.sort()
-    return difflib.SequenceMatcher(None, " ".join(t1), " ".join(t2)).ratio()
+    return token_sort_ratio_prepared(prepare_title(s1), prepare_title(s2))
 
 def token_set_ratio(s1, s2):
-    s1 = normalize_title(s1)
-    s2 = normalize_title(s2)
-    t1 = set(tokenize(s1))
-    t2 = set(tokenize(s2))
+    return token_set_ratio_prepared(prepare_title(s1), prepare_title(s2))
+
+def candidate_matchers(p):
+    """
+    difflib matchers with a prepared candidate's lowercased title, sorted tokens and sorted
+    unique tokens preloaded as seq2, so their b2j index is built once rather than per comparison.
+    """
+    return tuple(difflib.SequenceMatcher(None, b=seq) for seq in (p[0], p[1], p[3]))
+
+def _ratio_to(matchers, index, a, b, score_cutoff=0.0):
+    """_ratio(a, b), reusing matchers[index] (preloaded with b) if available."""
+    if matchers is None:
+        matcher = difflib.SequenceMatcher(None, b=b)
+    else:
+        matcher = matchers[index]
+    matcher.set_seq1(a)
+    # quick_ratio is an upper bound on ratio; skip the full comparison if it can't reach the cutoff
+    if score_cutoff and matcher.quick_ratio() < score_cutoff:
+        return 0.0
+    return matcher.ratio()
+
+def simple_ratio_prepared(p1, p2, matchers=None, score_cutoff=0.0):
+    return _ratio_to(matchers, 0, p1[0], p2[0], score_cutoff)
+
+def token_sort_ratio_prepared(p1, p2, matchers=None, score_cutoff=0.0):
+    return _ratio_to(matchers, 1, p1[1], p2[1], score_cutoff)
+
+def token_set_ratio_prepared(p1, p2, matchers=None, score_cutoff=0.0):
+    # No shared token: one integer AND instead of building the intersection set
+    if not p1[4] & p2[4]: return 0.0
+    
+    t1 = p1[2]
+    t2 = p2[2]
     
     intersection = t1.intersection(t2)
-    diff1 = t1.difference(t2)
-    diff2 = t2.difference(t1)
     
     if not intersection: return 0.0
     
-    sorted_inter = " ".join(sorted(list(intersection)))
-    sorted_t1 = " ".join(sorted(list(t1)))
-    sorted_t2 = " ".join(sorted(list(t2)))
+    sorted_inter = " ".join(sorted(intersection))
+    sorted_t1 = p1[3]
+    sorted_t2 = p2[3]
     
     # Combinations to check (FuzzyWuzzy logic)
     # 1. Intersection vs Intersection (Always 1.0, not useful alone, but implies subset)
@@ -99,27 +145,45 @@ def token_set_ratio(s1, s2):
     s2_full = sorted_t2
     
     vals = [
-        difflib.SequenceMatcher(None, s_inter, s1_full).ratio(),
-        difflib.SequenceMatcher(None, s_inter, s2_full).ratio(),
-        difflib.SequenceMatcher(None, s1_full, s2_full).ratio()
+        _ratio_to(None, 0, s_inter, s1_full, score_cutoff),
+        _ratio_to(matchers, 2, s_inter, s2_full, score_cutoff),
+        _ratio_to(matchers, 2, s1_full, s2_full, score_cutoff)
     ]
     return max(vals)
 
+async def fetch_raw_sx_leagues(sx):
+    """Active SX.Bet leagues as {title, group, key} dicts, straight from /leagues/active and /sports."""
+    res_leagues, res_sports = await asyncio.gather(
+        sx.make_request("GET", "/leagues/active"),
+        sx.make_request("GET", "/sports")
+    )
+    sport_map = {s["sportId"]: s["label"] for s in res_sports.json().get("data", [])}
+    return [
+        {
+            "title": league.get("label"),
+            "group": sport_map.get(league.get("sportId"), "Unknown Sport"),
+            "key": str(league.get("leagueId"))
+        }
+        for league in res_leagues.json().get("data", [])
+    ]
+
+# Method label of each score column, in tie-break priority order
+SCORE_METHODS = ("Simple", "Sort", "Set")
+# An exact simple match wins every tie (Simple > Sort > Set), so the token ratios can't
+# change the reported method or score and are not computed
+SIMPLE_RATIO_SHORT_CIRCUIT = 1.0
+
 async def main():
     print("Fetching active SX.Bet leagues...")
     
     # 1. Fetch SX Bet Leagues
     # We can perform a direct API call or use the class if config allows
-    sx = SXBetBookmaker(key="sx_bet", config={"use_testnet": False, "currency": "USDC"})
-    # We need to run obtain_sports to get leagues
-    # But obtain_sports usually maps them. We want raw titles.
-    # Let's look at obtain_sports implementation or fetch active leagues directly
+    sx = BookmakerFactory.get_bookmaker("sx_bet", {"use_testnet": False, "currency": "USDC"})
+    # obtain_sports maps every league to an internal key (DB lookups, and unmatched
+    # leagues are dropped). We want raw titles, so read the endpoints it is built on.
     
     try:
-        # Re-using the logic from obtain_sports but just getting raw data
-        # obtain_sports calls fetch_leagues internally if needed, or /sports
-        # Let's verify obtain_sports returns the leagues with titles
-        sx_leagues = await sx.obtain_sports() # This returns mapped dicts
+        sx_leagues = await fetch_raw_sx_leagues(sx)
         print(f"Fetched {len(sx_leagues)} leagues from SX.Bet")
     except Exception as e:
         print(f"Error fetching SX Bet leagues: {e}")
@@ -127,18 +191,29 @@ async def main():
 
     async with AsyncSessionLocal() as db:
         # 2. Fetch Internal Leagues
-        res = await db.execute(select(League))
+        # Exclude existing SX Bet leagues (in SQL) to test matching against generic
+        res = await db.execute(select(League).where(~League.key.startswith("sx_bet_", autoescape=True)))
         internal_leagues = res.scalars().all()
         print(f"Fetched {len(internal_leagues)} internal leagues from DB")
         
-        # Optimize lookup (exclude existing SX Bet leagues to test matching against generic)
-        leagues_by_group = {}
+        # Optimize lookup
+        leagues_by_group = defaultdict(list)
         for l in internal_leagues:
-            if not l.key.startswith("sx_bet_"):
-                leagues_by_group.setdefault(l.group, []).append(l)
+            leagues_by_group[l.group].append(l)
 
         print(f"Internal Groups (Generic): {list(leagues_by_group.keys())}")
 
+        # Candidate titles are tokenized/normalized once, not once per SX.Bet league
+        prepared_titles = {
+            l.id: prepare_title(l.title)
+            for group_leagues in leagues_by_group.values()
+            for l in group_leagues
+        }
+        prepared_matchers = {
+            league_id: candidate_matchers(prepared)
+            for league_id, prepared in prepared_titles.items()
+        }
+
         print(f"\n{'SX.Bet Title':<40} | {'Best Match (DB)':<40} | {'Score':<6} | {'Match?':<6} | {'Tokens'}")
         print("-" * 140)
 
@@ -158,25 +233,33 @@ async def main():
             best_match = None
             best_score = 0.0
             best_method = ""
+            sx_prepared = prepare_title(sx_title)
             
             # Current Logic (Simple Ratio)
             for cand in candidates:
+                cand_prepared = prepared_titles[cand.id]
+                cand_matchers = prepared_matchers[cand.id]
+                # Scores at or below best_score can't change the result, so they may be
+                # cut off (reported as 0.0) without being computed in full
                 # 1. Difflib Ratio
-                score_simple = simple_ratio(sx_title, cand.title)
-                
-                # 2. Token Sort Ratio
-                score_sort = token_sort_ratio(sx_title, cand.title)
-                
-                # 3. Token Set Ratio
-                score_set = token_set_ratio(sx_title, cand.title)
+                score_simple = simple_ratio_prepared(sx_prepared, cand_prepared, cand_matchers, best_score)
                 
-                # Pick best
-                current_best = max(score_simple, score_sort, score_set)
-                method = "Simple"
-                if score_sort > score_simple and score_sort >= score_set:
-                    method = "Sort"
-                elif score_set > score_simple and score_set > score_sort:
-                    method = "Set"
+                if score_simple >= SIMPLE_RATIO_SHORT_CIRCUIT:
+                    current_best, method = score_simple, SCORE_METHODS[0]
+                else:
+                    cutoff = max(best_score, score_simple)
+                    
+                    # 2. Token Sort Ratio
+                    score_sort = token_sort_ratio_prepared(sx_prepared, cand_prepared, cand_matchers, cutoff)
+                    
+                    # 3. Token Set Ratio
+                    score_set = token_set_ratio_prepared(sx_prepared, cand_prepared, cand_matchers, cutoff)
+                    
+                    # Pick best (one reduction; max keeps the first on ties, so Simple > Sort > Set)
+                    current_best, method = max(
+                        zip((score_simple, score_sort, score_set), SCORE_METHODS),
+                        key=itemgetter(0)
+                    )
                 
                 if current_best > best_score:
                     best_score = current_best
@@ -29,9 +29,8 @@ async def main():
         
         db.add(bk)
         await db.commit()
-        await db.refresh(bk)
         
-        print(f"Updated Config: {bk.config}")
+        print(f"Updated Config: {new_config}")
         print("SX Bet now configured for Mainnet (api.sx.bet).")
 
 if __name__ == "__main__":
@@ -49,19 +49,30 @@ async def test_event_fuzzy_matching():
         api_client = TheOddsAPIClient()
         ingester = DataIngester(api_client=api_client)
         
+        # Fetch TheOddsAPI and SX Bet odds concurrently; processing below stays ordered
+        print(f"\n[SYNC] Fetching TheOddsAPI and SX Bet odds for {league.key}...")
+        fetches = [
+            ingester.api_client.get_odds(
+                sport_key=league.key,
+                regions="us,uk,eu",
+                markets="h2h"
+            )
+        ]
+        if "sx_bet" in bookmakers:
+            from app.services.bookmakers.base import BookmakerFactory
+            sx_bet_service = BookmakerFactory.get_bookmaker("sx_bet")
+            fetches.append(sx_bet_service.fetch_league_odds(league.key))
+        toa_data, *sx_results = await asyncio.gather(*fetches, return_exceptions=True)
+        
         # Sync TheOddsAPI first (creates baseline)
         print(f"\n[SYNC] Syncing TheOddsAPI for {league.key}...")
         try:
-            odds_data = await ingester.api_client.get_odds(
-                sport=league.key,
-                regions="us,uk,eu",
-                markets="h2h",
-                odds_format="decimal"
-            )
-            if odds_data:
-                await ingester._process_odds_data(db, odds_data)
+            if isinstance(toa_data, Exception):
+                raise toa_data
+            if toa_data:
+                await ingester._process_odds_data(db, toa_data)
                 await db.commit()
-                print(f"[OK] Processed {len(odds_data)} events from TheOddsAPI")
+                print(f"[OK] Processed {len(toa_data)} events from TheOddsAPI")
         except Exception as e:
             print(f"[WARN] TheOddsAPI sync failed: {e}")
         
@@ -73,16 +84,16 @@ async def test_event_fuzzy_matching():
         print(f"[STATS] Events after TheOddsAPI: {events_after_toa}")
         
         # Sync SX Bet
-        if "sx_bet" in bookmakers:
+        if sx_results:
             print(f"\n[SYNC] Syncing SX Bet for {league.key}...")
             try:
-                from app.services.bookmakers.base import BookmakerFactory
-                sx_bet_service = BookmakerFactory.get_bookmaker("sx_bet")
-                odds_data = await sx_bet_service.fetch_league_odds(league.key)
-                if odds_data:
-                    await ingester._process_odds_data(db, odds_data)
+                sx_data = sx_results[0]
+                if isinstance(sx_data, Exception):
+                    raise sx_data
+                if sx_data:
+                    await ingester._process_odds_data(db, sx_data)
                     await db.commit()
-                    print(f"[OK] Processed {len(odds_data)} events from SX Bet")
+                    print(f"[OK] Processed {len(sx_data)} events from SX Bet")
                 else:
                     print("[WARN] No odds data from SX Bet")
             except Exception as e:
@@ -104,15 +115,15 @@ async def test_event_fuzzy_matching():
         
         # Check event_sid population
         if "sx_bet" in bookmakers:
+            # Both counts in one row (conditional aggregation) instead of a row per event_sid
             result = await db.execute(
-                select(Odds.event_sid, func.count(Odds.id))
+                select(
+                    func.count(Odds.id).filter(Odds.event_sid.is_(None)),
+                    func.count(Odds.id).filter(Odds.event_sid.is_not(None))
+                )
                 .where(Odds.bookmaker_id == bookmakers["sx_bet"].id)
-                .group_by(Odds.event_sid)
             )
-            sid_stats = result.all()
-            
-            null_count = sum(count for sid, count in sid_stats if sid is None)
-            populated_count = sum(count for sid, count in sid_stats if sid is not None)
+            null_count, populated_count = result.one()
             
             print(f"\n[STATS] SX Bet Odds event_sid stats:")
             print(f"  - Populated: {populated_count}")
@@ -7,7 +7,7 @@ import random
 # Add project root to path
 sys.path.append(os.getcwd())
 
-from sqlalchemy import select, update
+from sqlalchemy import select, update, case, func
 from app.db.session import AsyncSessionLocal
 from app.db.models import Bookmaker, Bet, Event, Market, Odds
 from app.core.enums import BetResult, BetStatus
@@ -31,8 +31,8 @@ async def verify_balance_logic():
             config={"starting_balance": STARTING_BALANCE}
         )
         db.add(bk)
-        await db.commit()
-        await db.refresh(bk)
+        # Flush (no commit) to get the bookmaker id; the setup rows are committed together below
+        await db.flush()
         print(f"   Created Bookmaker '{bk.title}' ({bk.id}) with Balance: {bk.balance}")
 
         # 2. Manual Bet Placement Simulation
@@ -43,7 +43,6 @@ async def verify_balance_logic():
         # Create Dummy Event/Market/Odds first
         event = Event(id=f"test_evt_{random.randint(1000,9999)}", sport_key="soccer", home_team="A", away_team="B", commence_time=datetime.now(timezone.utc))
         db.add(event)
-        await db.commit()
         
         # We need to use the actual router logic to test it properly, 
         # OR we simulate what the router does. 
@@ -64,6 +63,7 @@ async def verify_balance_logic():
             placed_at=datetime.now(timezone.utc)
         )
         db.add(bet)
+        # Single commit for the Bookmaker, Event and Bet setup
         await db.commit()
         
         # --- Simulate Router Logic ---
@@ -82,8 +82,8 @@ async def verify_balance_logic():
         
         db.add(bk)
         db.add(bet)
+        # Balance is already current in memory (expire_on_commit=False)
         await db.commit()
-        await db.refresh(bk)
         # -----------------------------
         
         print(f"   New Balance: {bk.balance}")
@@ -104,20 +104,25 @@ async def verify_balance_logic():
         # old_status = open
         # new_status = won
         
-        bet.status = BetResult.WON.value
-        bet.payout = PAYOUT
-        bet.settled_at = datetime.now(timezone.utc)
+        await db.execute(
+            update(Bet)
+            .where(Bet.id == bet.id)
+            .values(status=BetResult.WON.value, payout=PAYOUT, settled_at=datetime.now(timezone.utc))
+        )
         
         # Logic: 
         # if new_status == BetResult.WON.value:
         #    bet.bookmaker.balance += new_payout
         
-        bk.balance += PAYOUT
+        await db.execute(
+            update(Bookmaker)
+            .where(Bookmaker.id == bk.id)
+            .values(balance=Bookmaker.balance + PAYOUT)
+        )
         
-        db.add(bk)
-        db.add(bet)
+        # Settlement and balance credit in one commit; the ORM-enabled UPDATEs
+        # also apply the new values to the loaded bet and bookmaker objects
         await db.commit()
-        await db.refresh(bk)
         
         EXPECTED_AFTER_WIN = (STARTING_BALANCE - STAKE) + PAYOUT
         print(f"   Balance after WIN: {bk.balance}")
@@ -136,9 +141,14 @@ async def verify_balance_logic():
         # We have 1 Bet (WON): PnL = 50 (100 - 50)
         # Expected Running Balance End = 1050
         
-        # Fetch bets for analytics
-        stmt = select(Bet).where(Bet.bookmaker_id == bk.id).where(Bet.status.in_(['won', 'lost', 'void']))
-        bets = (await db.execute(stmt)).scalars().all()
+        # PnL of the settled bets, aggregated in SQL (one row instead of every bet)
+        pnl_expr = case(
+            (Bet.status == 'won', func.coalesce(Bet.payout, 0) - Bet.stake),
+            (Bet.status == 'lost', -Bet.stake),
+            else_=0.0
+        )
+        stmt = select(func.sum(pnl_expr)).where(Bet.bookmaker_id == bk.id).where(Bet.status.in_(['won', 'lost', 'void']))
+        pnl = (await db.execute(stmt)).scalar()
         
         # Analytics Logic copied from router
         total_starting_balance = 0.0
@@ -146,17 +156,7 @@ async def verify_balance_logic():
         starting = float(cfg.get("starting_balance", 0.0))
         total_starting_balance += starting
         
-        running_balance = total_starting_balance
-        
-        for b in bets:
-            pnl = 0.0
-            if b.status == 'won':
-                pnl = (b.payout or 0) - b.stake
-            elif b.status == 'lost':
-                pnl = -b.stake
-            elif b.status == 'void':
-                pnl = 0.0
-            running_balance += pnl
+        running_balance = total_starting_balance + float(pnl or 0.0)
             
         print(f"   Analytics Calculated Balance: {running_balance}")
         
@@ -2,6 +2,7 @@
 import asyncio
 import sys
 import os
+from collections import defaultdict
 from unittest.mock import MagicMock, AsyncMock
 from datetime import datetime
 
@@ -15,21 +16,22 @@ async def verify_ingestion():
     # Mock DB Session
     mock_db = MagicMock()
     
+    # Mock execution results for checks: one preallocated result, returned by every execute()
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = None 
+    
     # Mock async methods
-    mock_db.execute = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
     mock_db.commit = AsyncMock()
     mock_db.refresh = AsyncMock()
     
     # Mock Repository gets
-    # Mock League get
+    # Mock League get (memoized per (model, key))
     mock_league = League(key="soccer_epl", sport_key="soccer")
-    mock_db.get = AsyncMock()
-    mock_db.get.side_effect = lambda model, key: mock_league if model == League else None
-    
-    # Mock execution results for checks
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None 
-    mock_db.execute.return_value = mock_result
+    get_cache = {}
+    async def cached_get(model, key):
+        return get_cache.setdefault((model, key), mock_league if model == League else None)
+    mock_db.get = AsyncMock(side_effect=cached_get)
 
     # Mock API Client
     mock_api = MagicMock()
@@ -78,20 +80,18 @@ async def verify_ingestion():
 
     ingester = DataIngester(api_client=mock_api)
     
-    # Intercept db.add to captue Odds objects
-    added_objects = []
-    def capture_add(obj):
-        added_objects.append(obj)
-    mock_db.add.side_effect = capture_add
+    # Intercept db.add to captue Odds objects, sorted by type as they are added
+    added_by_type = defaultdict(list)
+    mock_db.add.side_effect = lambda obj: added_by_type[type(obj)].append(obj)
     
     # Run processing
     print("Running _process_odds_data...")
     await ingester._process_odds_data(mock_db, sample_odds_data)
     
     # Inspect Odds objects
-    print(f"Captured {len(added_objects)} objects sent to db.add()")
+    print(f"Captured {sum(map(len, added_by_type.values()))} objects sent to db.add()")
     
-    odds_objects = [obj for obj in added_objects if isinstance(obj, Odds)]
+    odds_objects = added_by_type[Odds]
     print(f"Found {len(odds_objects)} Odds objects.")
     
     for odd in odds_objects:
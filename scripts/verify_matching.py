@@ -24,7 +24,6 @@ async def main():
         
         # Clean up test data
         await db.execute(delete(Mapping).where(Mapping.source == "sx_bet"))
-        await db.commit()
         
         # Ensure generic NBA exists
         res = await db.execute(select(League).where(League.key == "basketball_nba"))
@@ -35,7 +34,8 @@ async def main():
             await db.merge(Sport(key="basketball", title="Basketball", group="Basketball", active=True))
             nba = League(key="basketball_nba", title="NBA", group="Basketball", active=True, sport_key="basketball")
             db.add(nba)
-            await db.commit()
+        # One commit for the cleanup and the seed data
+        await db.commit()
         
         # 2. Instantiate Ingester
         # mocking client as we won't call API
@@ -1,15 +1,18 @@
 import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, text
+from sqlalchemy import select, text, func
 from app.db.base import Base
 from app.db.models import Sport, League, Event, Bookmaker, Market, Odds
 from app.services.ingester import DataIngester
+from app.schemas.odds import OddsEvent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+# The script reports at INFO; keep SQLAlchemy's engine logging out of it
+logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 class MockApiClient:
@@ -43,7 +46,7 @@ async def verify_update():
             id=event_id, 
             sport_key=sport_key, 
             league_key=league_key, 
-            commence_time=datetime.utcnow(), 
+            commence_time=datetime.now(timezone.utc), 
             home_team="Home", 
             away_team="Away"
         ))
@@ -54,9 +57,10 @@ async def verify_update():
         
         # 1. Simulate First Ingestion (Create)
         logger.info("--- 1. Processing Initial Odds (Create) ---")
-        odds_data_1 = [{
+        odds_data_1 = [OddsEvent.model_validate({
             "id": event_id,
             "sport_key": league_key,
+            "sport_title": "EPL",
             "commence_time": "2024-01-01T12:00:00Z",
             "home_team": "Home",
             "away_team": "Away",
@@ -67,12 +71,13 @@ async def verify_update():
                 "markets": [{
                     "key": market_key,
                     "outcomes": [{
-                        "name": selection_name,
+                        "selection": selection_name,
+                        "normalized_selection": "home",
                         "price": initial_price
                     }]
                 }]
             }]
-        }]
+        })]
         
         await ingester._process_odds_data(db, odds_data_1)
         
@@ -80,14 +85,16 @@ async def verify_update():
         result = await db.execute(select(Odds))
         odd = result.scalar_one()
         odd_id_initial = odd.id
-        logger.info(f"Created Odd ID: {odd.id}, Price: {odd.price}")
+        logger.info("Created Odd ID: %s, Price: %s", odd.id, odd.price)
         assert odd.price == initial_price
+        events_initial = (await db.execute(select(func.count(Event.id)))).scalar()
         
         # 2. Simulate Second Ingestion (Update)
         logger.info("--- 2. Processing Updated Odds (Update) ---")
-        odds_data_2 = [{
+        odds_data_2 = [OddsEvent.model_validate({
             "id": event_id,
             "sport_key": league_key, # Same event
+            "sport_title": "EPL",
             "commence_time": "2024-01-01T12:00:00Z",
             "home_team": "Home",
             "away_team": "Away",
@@ -98,28 +105,38 @@ async def verify_update():
                 "markets": [{
                     "key": market_key, # Same market
                     "outcomes": [{
-                        "name": selection_name, # Same selection
+                        "selection": selection_name, # Same selection
+                        "normalized_selection": "home",
                         "price": updated_price # NEW PRICE
                     }]
                 }]
             }]
-        }]
+        })]
         
         await ingester._process_odds_data(db, odds_data_2)
         
         # Verify Update
-        result = await db.execute(select(Odds))
-        odd_updated = result.unique().scalar_one() # Should still be one record
+        odds_count = (await db.execute(select(func.count(Odds.id)))).scalar()
+        assert odds_count == 1, f"Should still be one record, found {odds_count}"
+        # Primary-key lookup; populate_existing reloads the row in case it was upserted behind the ORM
+        odd_updated = await db.get(Odds, odd_id_initial, populate_existing=True)
+        if odd_updated is None:
+            # Row was replaced (delete/create); load the new one for the report below
+            odd_updated = (await db.execute(select(Odds))).scalar_one()
         
-        logger.info(f"Updated Odd ID: {odd_updated.id}, Price: {odd_updated.price}")
+        logger.info("Updated Odd ID: %s, Price: %s", odd_updated.id, odd_updated.price)
         
         if odd_updated.id == odd_id_initial:
             logger.info("SUCCESS: Odds ID persisted (Update logic worked).")
         else:
-            logger.error(f"FAILURE: Odds ID changed! Initial: {odd_id_initial}, New: {odd_updated.id} (Delete/Create logic happened).")
+            logger.error("FAILURE: Odds ID changed! Initial: %s, New: %s (Delete/Create logic happened).", odd_id_initial, odd_updated.id)
             
         assert odd_updated.id == odd_id_initial, "Odds ID should not change"
         assert odd_updated.price == updated_price, "Price should be updated"
+        
+        # The event upsert must update the event in place, not add another one
+        events_updated = (await db.execute(select(func.count(Event.id)))).scalar()
+        assert events_updated == events_initial, f"Expected {events_initial} events, found {events_updated}"
 
     await engine.dispose()
 
@@ -1,6 +1,7 @@
 import asyncio
 import sys
 import os
+import re
 from sqlalchemy import select, delete
 
 sys.path.append(os.getcwd())
@@ -11,6 +12,8 @@ from app.services.ingester import DataIngester
 from app.services.the_odds_api import TheOddsAPIClient
 from app.core.config import settings
 
+CHAMPIONS_LEAGUE_UEFA_RE = re.compile(r"champions league.*uefa", re.IGNORECASE | re.DOTALL)
+
 async def main():
     async with AsyncSessionLocal() as db:
         print("Cleaning up previous SX Bet mappings/leagues...")
@@ -44,17 +47,20 @@ async def main():
         # 4. Verify Mapping
         print("Verifying mappings...")
         
+        # Prefetch once (two queries) and do the lookups below in Python
+        sx_mappings = (await db.execute(select(Mapping).where(Mapping.source == "sx_bet"))).scalars().all()
+        maps_by_name = {m.external_name: m for m in sx_mappings if m.external_name}
+        leagues_by_title = {l.title.lower(): l for l in (await db.execute(select(League))).scalars().all() if l.title}
+        
         # Check specific known case
         # We expect a mapping for "Netherlands - Eredivisie" -> "soccer_netherlands_eredivisie" (or similar)
         
         # Find the correct internal key for Eredivisie
-        l_res = await db.execute(select(League).where(League.title.ilike("%Eredivisie%")))
-        eredivisie_leagues = l_res.scalars().all()
+        eredivisie_leagues = [l for title, l in leagues_by_title.items() if "eredivisie" in title]
         print(f"Internal Eredivisie candidates: {[l.key for l in eredivisie_leagues]}")
         
         # Check mappings
-        result = await db.execute(select(Mapping).where(Mapping.source == "sx_bet", Mapping.external_name.ilike("%Eredivisie%")))
-        mappings = result.scalars().all()
+        mappings = [m for name, m in maps_by_name.items() if "eredivisie" in name.lower()]
         
         mapped = False
         for m in mappings:
@@ -67,8 +73,7 @@ async def main():
 
         # Check PREMIER LEAGUE (Should match English Premier League, NOT A-League)
         # Assuming internal key is 'soccer_epl'
-        res_pl = await db.execute(select(Mapping).where(Mapping.source == "sx_bet", Mapping.external_name == "English Premier League"))
-        map_pl = res_pl.scalar_one_or_none()
+        map_pl = maps_by_name.get("English Premier League")
         if map_pl:
             print(f"PL Mapping: {map_pl.internal_key}")
             if "epl" in map_pl.internal_key:
@@ -80,8 +85,11 @@ async def main():
 
         # Check CHAMPIONS LEAGUE (Should match UEFA Champions League)
         # Assuming internal key is 'soccer_uefa_champs_league'
-        res_cl = await db.execute(select(Mapping).where(Mapping.source == "sx_bet", Mapping.external_name.ilike("%Champions League%UEFA%")))
-        map_cl = res_cl.scalar_one_or_none()
+        # Same match as ILIKE '%Champions League%UEFA%'
+        map_cl = next(
+            (m for name, m in maps_by_name.items() if CHAMPIONS_LEAGUE_UEFA_RE.search(name)),
+            None
+        )
         if map_cl:
              print(f"CL Mapping: {map_cl.internal_key}")
              if "uefa_champs_league" in map_cl.internal_key:
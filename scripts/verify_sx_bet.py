@@ -10,6 +10,17 @@ from app.services.bookmakers.base import BookmakerFactory
 from app.db.models import Bookmaker
 from sqlalchemy import select
 
+try:
+    # Optional fast JSON parser, as used by SXBetBookmaker (pip install "betfinder[speedups]")
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+async def fetch_active_fixtures(sx_service, league):
+    """Active fixtures of an obtain_sports league (GET /fixture/active, as fetch_events does)."""
+    res = await sx_service.make_request("GET", "/fixture/active", params={"leagueId": league['details']['league_id']})
+    return _json_loads(res.content).get("data", [])
+
 async def main():
     print("Starting verification of SXBetBookmaker... VERSION 2")
     
@@ -55,41 +66,52 @@ async def main():
             
             # 4. Test Fetch Odds (using first league)
             # Try to find a league with events?
-            # Let's try a few
-            for league in sports[:5]:
+            # Let's try a few. fetch_events looks the league id up through the shared DB
+            # session, which can't serve concurrent queries; obtain_sports already returned
+            # the ids, so the fixture requests for all five leagues are made concurrently.
+            candidate_leagues = sports[:5]
+            events_per_league = await asyncio.gather(
+                *(fetch_active_fixtures(sx_service, league) for league in candidate_leagues),
+                return_exceptions=True
+            )
+            for league, events in zip(candidate_leagues, events_per_league):
                 print(f"Checking {league['key']} ({league['title']})...")
-                events = await sx_service.fetch_events(league['key'])
+                if isinstance(events, Exception):
+                    print(f"Error fetching events for league {league['key']}: {events}")
+                    continue
                 if events:
                     print(f"Found {len(events)} events in {league['title']}.")
                     
                     # DEBUG: Raw API Check
+                    # obtain_sports already stores the league id as a string
                     league_id = league['details']['league_id']
-                    # Use str(league_id) to be safe
-                    league_id = str(league_id)
                     
-                    print(f"DEBUG: Fetching markets for league {league_id}...")
-                    res_m = await sx_service.make_request("GET", "/markets/active", params={"leagueId": league_id, "onlyMainLine": "true"})
-                    markets = res_m.json().get("data", {}).get("markets", [])
+                    # Raw markets, raw best odds and the bulk method are independent requests;
+                    # only fetch_league_odds uses the DB session, so they can run together
+                    print(f"DEBUG: Fetching markets and odds for league {league_id}...")
+                    print(f"Testing fetch_league_odds (Bulk)...")
+                    res_m, res_o, odds = await asyncio.gather(
+                        sx_service.make_request("GET", "/markets/active", params={"leagueId": league_id, "onlyMainLine": "true"}),
+                        sx_service.make_request("GET", "/orders/odds/best", params={
+                            "leagueIds": league_id, # Trying singular and plural just in case
+                            "baseToken": sx_service.base_token
+                        }),
+                        sx_service.fetch_league_odds(league['key'])
+                    )
+                    markets = _json_loads(res_m.content).get("data", {}).get("markets", [])
                     print(f"DEBUG: Found {len(markets)} active main-line markets.")
                     
                     if markets:
                         print(f"DEBUG: Sample Market Keys: {list(markets[0].keys())}")
                         print(f"DEBUG: Sample Market Object: {markets[0]}")
                         
-                        print(f"DEBUG: Fetching odds for league {league_id}...")
-                        res_o = await sx_service.make_request("GET", "/orders/odds/best", params={
-                            "leagueIds": league_id, # Trying singular and plural just in case
-                            "baseToken": sx_service.base_token
-                        })
-                        odds_data = res_o.json().get("data", {}).get("bestOdds", [])
+                        odds_data = _json_loads(res_o.content).get("data", {}).get("bestOdds", [])
                         print(f"DEBUG: Found {len(odds_data)} odds entries.")
                         if odds_data:
                             print(f"Sample Odds keys: {list(odds_data[0].keys())}")
                             print(f"Sample Odds: {odds_data[0]}")
                     
-                    # Now fetch odds via method (Bulk)
-                    print(f"Testing fetch_league_odds (Bulk)...")
-                    odds = await sx_service.fetch_league_odds(league['key'])
+                    # Now the odds via method (Bulk)
                     print(f"Fetched generic odds data for {league['title']}: {len(odds)} active events with odds.")
                     
                     if odds:
@@ -44,7 +44,7 @@ async def main():
             return
             
         params = {
-            "uuid": str(row.id),
+            "uuid": row.id, # Event.id is already a string column
             "sx_id": row.event_sid,
             "league": row.league_key
         }
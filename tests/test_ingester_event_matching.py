@@ -0,0 +1,88 @@
+"""
+Tests for DataIngester event matching within a single odds chunk.
+
+Events of a chunk are upserted together after the loop, so two sources reporting
+the same match in one chunk must be fuzzy matched against each other in memory.
+"""
+
+import pytest
+import pytest_asyncio
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db.base import Base
+from app.db.models import Sport, League, Event, Odds
+from app.schemas.odds import OddsEvent
+from app.services.ingester import DataIngester
+
+pytestmark = pytest.mark.asyncio
+
+LEAGUE = "soccer_epl"
+
+
+@pytest_asyncio.fixture
+async def db() -> AsyncSession:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        session.add(Sport(key="soccer", title="Soccer", group="Soccer"))
+        session.add(League(key=LEAGUE, title="EPL", group="Soccer", sport_key="soccer"))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def make_event(event_id: str, home: str, away: str, bookmaker: str, commence: str) -> OddsEvent:
+    return OddsEvent.model_validate({
+        "id": event_id,
+        "sport_key": LEAGUE,
+        "sport_title": "EPL",
+        "commence_time": commence,
+        "home_team": home,
+        "away_team": away,
+        "bookmakers": [{
+            "key": bookmaker,
+            "title": bookmaker,
+            "last_update": "2026-01-01T10:00:00Z",
+            "markets": [{
+                "key": "h2h",
+                "outcomes": [
+                    {"selection": home, "normalized_selection": "home", "price": 2.0},
+                    {"selection": away, "normalized_selection": "away", "price": 3.5},
+                ]
+            }]
+        }]
+    })
+
+
+async def test_same_match_from_two_sources_in_one_chunk(db: AsyncSession):
+    """Two bookmakers naming the same match differently produce one event with both lines."""
+    ingester = DataIngester(api_client=None)
+    chunk = [
+        make_event("src_a_1", "Manchester United", "Arsenal", "bookie_a", "2026-01-01T15:00:00Z"),
+        # Same match, slightly different name and kick-off time, from another source
+        make_event("src_b_9", "Manchester Utd", "Arsenal", "bookie_b", "2026-01-01T15:02:00Z"),
+    ]
+
+    await ingester._process_odds_data(db, chunk)
+
+    events = (await db.execute(select(Event))).scalars().all()
+    assert len(events) == 1
+    odds_count = (await db.execute(select(func.count(Odds.id)))).scalar()
+    assert odds_count == 4
+
+
+async def test_different_matches_in_one_chunk_stay_separate(db: AsyncSession):
+    ingester = DataIngester(api_client=None)
+    chunk = [
+        make_event("src_a_1", "Manchester United", "Arsenal", "bookie_a", "2026-01-01T15:00:00Z"),
+        make_event("src_a_2", "Chelsea", "Liverpool", "bookie_a", "2026-01-01T15:00:00Z"),
+    ]
+
+    await ingester._process_odds_data(db, chunk)
+
+    event_count = (await db.execute(select(func.count(Event.id)))).scalar()
+    assert event_count == 2
@@ -6,11 +6,15 @@ import time
 import webbrowser
 import shutil
 import logging
+import json
 import platform
 import secrets
-from logging.handlers import RotatingFileHandler
-from PIL import Image
-import pystray
+import re
+import ctypes
+import atexit
+import socket
+import select
+from logging.handlers import RotatingFileHandler, MemoryHandler
 
 # --- Configuration ---
 APP_NAME = "Sports Bet Finder"
@@ -28,20 +32,42 @@ if getattr(sys, 'frozen', False):
         # /dist/version/darwin/Folder/BetFinderApp.app/Contents/MacOS/Exe
         # And our resources might be in /dist/version/darwin/Folder/backend
         
-        possible_roots = [
-            os.path.join(APP_DIR, "..", "Resources"),               # Contents/Resources (Standard Bundle)
-            os.path.abspath(os.path.join(APP_DIR, "..", "..")),     # BetFinderApp.app Root
-            os.path.abspath(os.path.join(APP_DIR, "..", "..", "..")) # Folder containing .app (Parallel to .app)
-        ]
+        # Root resolved on a previous launch of this same executable (skips the probing below)
+        paths_cache_file = os.path.join(os.path.expanduser("~"), ".betfinder", "paths.json")
+        cached_root = None
+        try:
+            with open(paths_cache_file, "r") as f:
+                cached = json.load(f)
+            if cached.get("executable") == sys.executable:
+                cached_root = cached.get("app_dir")
+        except Exception:
+            pass
+
+        if cached_root and os.path.isdir(os.path.join(cached_root, "backend")):
+            possible_roots = [cached_root]
+        else:
+            possible_roots = [
+                os.path.join(APP_DIR, "..", "Resources"),               # Contents/Resources (Standard Bundle)
+                os.path.abspath(os.path.join(APP_DIR, "..", "..")),     # BetFinderApp.app Root
+                os.path.abspath(os.path.join(APP_DIR, "..", "..", "..")) # Folder containing .app (Parallel to .app)
+            ]
 
         found_backend = False
         for root in possible_roots:
-            if os.path.exists(os.path.join(root, "backend")):
+            if os.path.isdir(os.path.join(root, "backend")):
                 # Found backend - logger not available yet, will log later
                 APP_DIR = root
                 found_backend = True
                 break
 
+        if found_backend and APP_DIR != cached_root:
+            try:
+                os.makedirs(os.path.dirname(paths_cache_file), exist_ok=True)
+                with open(paths_cache_file, "w") as f:
+                    json.dump({"executable": sys.executable, "app_dir": APP_DIR}, f)
+            except Exception:
+                pass
+
         if not found_backend:
             # Could not locate backend directory - logger not available yet
             # Default will remain Contents/MacOS, which will likely fail, but we tried.
@@ -87,20 +113,51 @@ if not os.path.exists(LOG_DIR):
          pass
 
 log_file = os.path.join(LOG_DIR, "app.log")
+# "View Logs" opens a copy of only the last LOG_TAIL_BYTES, overwritten on each click
+log_tail_file = os.path.join(LOG_DIR, "app.tail.log")
+LOG_TAIL_BYTES = 1024 * 1024
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_FLUSH_INTERVAL = 2.0
+
+# File records are buffered in memory and written in batches: on 256 records, on ERROR,
+# every LOG_FLUSH_INTERVAL seconds and on exit (the server output reader logs every line).
+if os.path.exists(LOG_DIR):
+    rotating_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=5)
+    rotating_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    file_handler = MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=rotating_handler, flushOnClose=True)
+else:
+    file_handler = logging.NullHandler()
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format=LOG_FORMAT,
     handlers=[
-        RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=5) if os.path.exists(LOG_DIR) else logging.NullHandler(),
+        file_handler,
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger("TrayApp")
 
+def flush_logs():
+    """Write any buffered log records to the log file."""
+    file_handler.flush()
+
+# Own event rather than stop_event, which is set and cleared again on every server restart
+log_flush_stop = threading.Event()
+
+def _periodic_log_flush():
+    """Flush buffered log records every LOG_FLUSH_INTERVAL seconds until log_flush_stop is set."""
+    while not log_flush_stop.wait(LOG_FLUSH_INTERVAL):
+        flush_logs()
+
+atexit.register(flush_logs)
+
 # --- Global State ---
 server_process = None
+server_job = None  # Windows Job Object handle owning the server process tree
 stop_event = threading.Event()
+core_thread = None  # Startup thread running orchestrate_core before the tray UI is loaded
 
 def ensure_environment():
     """Ensure data directory and .env file exist."""
@@ -119,25 +176,12 @@ def ensure_environment():
                 # Auto-generate a strong API Access Key
                 generated_key = secrets.token_urlsafe(32)
                 
-                # Replace the empty key with the generated one
-                # We assume the line is "SECRET_KEY=" or "SECRET_KEY"
-                if "SECRET_KEY=" in content:
-                    lines = content.splitlines()
-                    new_lines = []
-                    for line in lines:
-                        if line.strip().startswith("SECRET_KEY="):
-                            # Check if it is empty or we force overwrite? User asked for auto generate.
-                            # Usually sample has "API_ACCESS_KEY=" (empty)
-                            if line.strip() == "SECRET_KEY=":
-                                new_lines.append(f"SECRET_KEY={generated_key}")
-                            else:
-                                new_lines.append(line) # Keep existing if sample had one?
-                        else:
-                            new_lines.append(line)
-                    content = "\n".join(new_lines)
+                # Fill in an empty (or sample placeholder) "SECRET_KEY=" line, keep a real value,
+                # and append the key if the sample doesn't mention it at all
+                if re.search(r"^\s*SECRET_KEY=", content, flags=re.M):
+                    content = re.sub(r"^[ \t]*SECRET_KEY=[ \t]*(your_secret_key_here)?[ \t]*$", lambda m: f"SECRET_KEY={generated_key}", content, count=1, flags=re.M)
                 else:
-                    # Append it if not found
-                    content += f"\SECRET_KEY={generated_key}\n"
+                    content = content.rstrip("\n") + f"\nSECRET_KEY={generated_key}\n"
                 
                 with open(ENV_FILE, "w") as f_dest:
                     f_dest.write(content)
@@ -187,6 +231,34 @@ def run_migrations(env, executable):
         logger.error(f"Failed to run database migrations: {e}")
         return False
 
+def sync_env_file(src_path, dst_path):
+    """Make dst_path match src_path: skip if unchanged, else hardlink (or copy2 as fallback)."""
+    src = os.stat(src_path)
+    try:
+        dst = os.stat(dst_path)
+    except FileNotFoundError:
+        dst = None
+
+    if dst and (dst.st_mtime_ns, dst.st_size) == (src.st_mtime_ns, src.st_size):
+        return
+
+    # Timestamps differ: skip anyway if the destination already has the same content
+    if dst and dst.st_size == src.st_size:
+        with open(src_path, "rb") as f_src, open(dst_path, "rb") as f_dst:
+            if f_src.read() == f_dst.read():
+                return
+
+    tmp_path = dst_path + ".tmp"
+    try:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        os.link(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    except OSError:
+        # Different filesystem, or hardlinks not permitted: copy, preserving mtime for the check above
+        shutil.copy2(src_path, dst_path)
+    logger.info(f"Synced {src_path} to {dst_path}")
+
 def prepare_environment():
     """Prepare environment variables and return the env dict."""
     # Ensure data/.env is synced to backend/.env
@@ -195,8 +267,7 @@ def prepare_environment():
 
     if os.path.exists(ENV_FILE):
         try:
-            shutil.copy(ENV_FILE, backend_env)
-            logger.info(f"Synced {ENV_FILE} to {backend_env}")
+            sync_env_file(ENV_FILE, backend_env)
         except Exception as e:
             logger.error(f"Failed to copy .env to backend: {e}")
     else:
@@ -207,9 +278,108 @@ def prepare_environment():
         
     return env, env_missing
 
+# Windows process creation flag: create the process with its primary thread suspended
+CREATE_SUSPENDED = 0x00000004
+
+def _win_api():
+    """kernel32 and ntdll with the argument types used by the job helpers below (Windows only)."""
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.SetInformationJobObject.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD]
+    kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    ntdll = ctypes.WinDLL("ntdll")
+    ntdll.NtResumeProcess.argtypes = [wintypes.HANDLE]
+    return kernel32, ntdll
+
+def create_kill_on_close_job():
+    """Create a Windows Job Object that kills every process in it when its handle is closed.
+
+    Returns the job handle, or None if the job could not be set up.
+    """
+    from ctypes import wintypes
+
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_ulonglong) for name in (
+            "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+            "ReadTransferCount", "WriteTransferCount", "OtherTransferCount")]
+
+    class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+
+    class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+    JobObjectExtendedLimitInformation = 9
+
+    kernel32, _ = _win_api()
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        logger.error(f"CreateJobObjectW failed: {ctypes.get_last_error()}")
+        return None
+
+    info = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+    info.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+    if not kernel32.SetInformationJobObject(job, JobObjectExtendedLimitInformation, ctypes.byref(info), ctypes.sizeof(info)):
+        logger.error(f"SetInformationJobObject failed: {ctypes.get_last_error()}")
+        kernel32.CloseHandle(job)
+        return None
+    return job
+
+def close_job(job):
+    """Close a job handle; with KILL_ON_JOB_CLOSE this ends every process in the job."""
+    kernel32, _ = _win_api()
+    kernel32.CloseHandle(job)
+
+def resume_in_job(job, pid):
+    """Assign a process created with CREATE_SUSPENDED to `job`, then resume it.
+
+    The process can't spawn children before it is resumed, so none escape the job.
+    Returns True if the process was assigned; it is resumed either way.
+    Raises OSError if the process can't be opened (it is then left suspended).
+    """
+    PROCESS_TERMINATE = 0x0001
+    PROCESS_SET_QUOTA = 0x0100
+    PROCESS_SUSPEND_RESUME = 0x0800
+
+    kernel32, ntdll = _win_api()
+    handle = kernel32.OpenProcess(PROCESS_TERMINATE | PROCESS_SET_QUOTA | PROCESS_SUSPEND_RESUME, False, pid)
+    if not handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        assigned = bool(kernel32.AssignProcessToJobObject(job, handle))
+        if not assigned:
+            logger.error(f"Failed to assign server to a job object: {ctypes.get_last_error()}")
+        ntdll.NtResumeProcess(handle)
+    finally:
+        kernel32.CloseHandle(handle)
+    return assigned
+
 def run_server_process(env):
     """Target function to run the server subprocess."""
-    global server_process
+    global server_process, server_job
     
     # Verify paths
     if not os.path.exists(BACKEND_DIR):
@@ -231,24 +401,41 @@ def run_server_process(env):
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
 
+        # On Windows the server runs in a kill-on-close job (see stop_server). It is created
+        # suspended and only resumed once inside the job, so no child process escapes it.
+        creationflags = 0
+        job = None
+        if platform.system() == "Windows":
+            creationflags = subprocess.CREATE_NO_WINDOW
+            job = create_kill_on_close_job()
+            if job:
+                creationflags |= CREATE_SUSPENDED
+
         server_process = subprocess.Popen(
             cmd,
             cwd=BACKEND_DIR,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
+            bufsize=0,
             env=env,
             startupinfo=startupinfo,
-            creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+            creationflags=creationflags
         )
+        if job:
+            try:
+                assigned = resume_in_job(job, server_process.pid)
+            except OSError as e:
+                logger.error(f"Failed to resume server process: {e}")
+                server_process.kill()
+                close_job(job)
+                return
+            if assigned:
+                server_job = job
+            else:
+                close_job(job)
         
-        # Read output line by line and log it
-        for line in server_process.stdout:
-            if stop_event.is_set():
-                break
-            line = line.strip()
-            if line:
-                logger.info(f"[Server] {line}")
+        # Read output in bulk chunks and log it line by line
+        read_server_output(server_process.stdout)
                 
         server_process.wait()
         logger.info(f"Server process exited with code {server_process.returncode}")
@@ -256,12 +443,34 @@ def run_server_process(env):
     except Exception as e:
         logger.error(f"Failed to start server: {e}")
 
+def read_server_output(pipe):
+    """Drain the server's raw stdout pipe in 64KiB reads, logging each complete line."""
+    fd = pipe.fileno()
+    # select() only works on pipes on POSIX; on Windows the read simply blocks (daemon thread)
+    use_select = platform.system() != "Windows"
+    buf = b""
+    while not stop_event.is_set():
+        if use_select:
+            ready, _, _ = select.select([pipe], [], [], 0.5)
+            if not ready:
+                continue
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            line = line.strip()
+            if line:
+                logger.info("[Server] %s", line.decode(errors="replace"))
+    if buf.strip():
+        logger.info("[Server] %s", buf.strip().decode(errors="replace"))
+
 def start_server_thread(env):
     """Start the server in a separate thread."""
     global stop_event
     stop_event.clear()
-    t = threading.Thread(target=run_server_process, args=(env,))
-    t.daemon = True
+    t = threading.Thread(target=run_server_process, args=(env,), daemon=True)
     t.start()
 
 def get_executable():
@@ -270,24 +479,74 @@ def get_executable():
         executable = "uv"
     return executable
 
+def wait_for_port(port, timeout=15.0, interval=0.05):
+    """Poll until something accepts connections on localhost:port. Returns False on timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.settimeout(0.1)
+        try:
+            rc = s.connect_ex(("127.0.0.1", port))
+        finally:
+            s.close()
+        if rc == 0:
+            return True
+        time.sleep(interval)
+    return False
+
 def orchestrate_startup(icon):
     """Run full startup sequence: Env -> Migrations -> Server -> Browser."""
     icon.notify("Initializing application...", APP_NAME)
-    
+    orchestrate_core()
+    orchestrate_ui(icon)
+
+def orchestrate_core():
+    """Startup steps that need no tray icon: Env -> Migrations -> Server."""
     # 1. Prepare Environment
     env, env_missing = prepare_environment()
     
-    # 2. Run Migrations (only if env exists)
+    # 2. Run Migrations (only if env exists) alongside the server start.
+    # The server imports and binds meanwhile, but holds its startup DB work until the
+    # MIGRATIONS_PENDING_FILE marker is removed once migrations finish.
+    migration_thread = None
     if not env_missing:
         executable = get_executable()
-        run_migrations(env, executable)
+        marker = os.path.join(DATA_DIR, ".migrations_pending")
+        try:
+            open(marker, "w").close()
+            env["MIGRATIONS_PENDING_FILE"] = marker
+        except Exception as e:
+            logger.error(f"Failed to create migration marker, running migrations first: {e}")
+            marker = None
+
+        def migrate():
+            try:
+                run_migrations(env, executable)
+            finally:
+                if marker and os.path.exists(marker):
+                    os.remove(marker)
+
+        if marker:
+            migration_thread = threading.Thread(target=migrate, daemon=True)
+            migration_thread.start()
+        else:
+            migrate()
     
     # 3. Start Server
     start_server_thread(env)
-    
+
+    if migration_thread:
+        migration_thread.join(timeout=30)
+        if migration_thread.is_alive():
+            logger.warning("Database migrations still running after 30s.")
+
+def orchestrate_ui(icon):
+    """Startup steps that need the tray icon: wait for the server -> Browser."""
     # 4. Wait for Server to Warm Up
-    # We can't easily poll the port without extra deps, so we just sleep confidently
-    time.sleep(5)
+    # The server thread is already booting; poll its port instead of sleeping a fixed time
+    port = get_port_from_env()
+    if not wait_for_port(port):
+        logger.warning(f"Server did not accept connections on port {port} within 15s, opening browser anyway.")
     
     # 5. Open Browser and Notify
     on_open_web(icon, None)
@@ -295,13 +554,17 @@ def orchestrate_startup(icon):
 
 def stop_server():
     """Stop the running server."""
-    global server_process, stop_event
+    global server_process, server_job, stop_event
     stop_event.set()
     if server_process:
         logger.info("Terminating server process...")
         
-        # On Windows, we need to kill the process tree forcefully to ensure uvicorn/uv dies
-        if platform.system() == "Windows":
+        # On Windows, we need to kill the process tree forcefully to ensure uvicorn/uv dies.
+        # Closing the kill-on-close job does that in one call; taskkill is the fallback.
+        if platform.system() == "Windows" and server_job:
+            close_job(server_job)
+            server_job = None
+        elif platform.system() == "Windows":
              try:
                  subprocess.call(["taskkill", "/F", "/T", "/PID", str(server_process.pid)], 
                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -325,6 +588,8 @@ def stop_server():
         
         server_process = None
 
+    flush_logs()
+
 def restart_server(icon, item):
     """Restart operation."""
     icon.notify("Restarting server...", APP_NAME)
@@ -335,21 +600,32 @@ def restart_server(icon, item):
     # Let's do full orchestration to be safe and consistent.
     orchestrate_startup(icon)
 
+# Parsed .env contents, keyed on the file's (mtime, size) so it is only re-read after edits
+_env_cache = {"key": None, "data": {}}
+
 def get_port_from_env():
     """Simple parser to get PORT from .env file."""
     port = 8123
-    if os.path.exists(ENV_FILE):
+    try:
+        st = os.stat(ENV_FILE)
+    except OSError:
+        return port
+
+    key = (st.st_mtime_ns, st.st_size)
+    if _env_cache["key"] != key:
         try:
             with open(ENV_FILE, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("PORT="):
-                        try:
-                            port = int(line.split("=")[1].strip())
-                        except ValueError:
-                            pass
+                stripped = (line.strip() for line in f)
+                data = {k.strip(): v.strip() for k, _, v in (line.partition("=") for line in stripped) if k and not k.startswith("#")}
         except Exception:
-            pass
+            return port
+        _env_cache["key"] = key
+        _env_cache["data"] = data
+
+    try:
+        port = int(_env_cache["data"].get("PORT", port))
+    except ValueError:
+        pass
     return port
 
 def on_open_web(icon, item):
@@ -365,10 +641,27 @@ def on_settings(icon, item):
         open_file(ENV_FILE)
 
 def on_logs(icon, item):
+    flush_logs()
     open_file(log_file)
 
+def on_logs_tail(icon, item):
+    """Open a copy of the last LOG_TAIL_BYTES of the log, so editors never load more than that."""
+    flush_logs()
+    try:
+        size = os.path.getsize(log_file)
+        with open(log_file, "rb") as f:
+            f.seek(max(0, size - LOG_TAIL_BYTES))
+            data = f.read()
+        with open(log_tail_file, "wb") as f:
+            f.write(data)
+        open_file(log_tail_file)
+    except Exception as e:
+        logger.error(f"Failed to open log tail: {e}")
+        on_logs(icon, item)
+
 def on_quit(icon, item):
     stop_server()
+    log_flush_stop.set()
     icon.stop()
 
 def setup(icon):
@@ -378,13 +671,25 @@ def setup(icon):
     # Pystray run() blocks, so setup() is called. But setup runs in the main thread usually?
     # Pystray documentation says setup is called in a separate thread depending on backend.
     # To be safe, let's run orchestration immediately here.
-    orchestrate_startup(icon)
+    # main() already started the core steps before loading the UI; finish those first.
+    icon.notify("Initializing application...", APP_NAME)
+    if core_thread:
+        core_thread.join()
+    orchestrate_ui(icon)
 
 def main():
+    global core_thread
     logger.info(f"Starting {APP_NAME}...")
+    threading.Thread(target=_periodic_log_flush, daemon=True).start()
     
     ensure_environment()
-    # start_server() -> Removed, moved to orchestration
+    # Env, migrations and server start don't need the tray, so run them while the UI stack loads
+    core_thread = threading.Thread(target=orchestrate_core, daemon=True)
+    core_thread.start()
+
+    # Imported here rather than at module level to keep them off the server startup path
+    from PIL import Image
+    import pystray
     
     # Load icon
     image = None
@@ -401,7 +706,7 @@ def main():
     menu = pystray.Menu(
         pystray.MenuItem("Open Web App", on_open_web, default=True),
         pystray.MenuItem("Settings", on_settings),
-        pystray.MenuItem("View Logs", on_logs),
+        pystray.MenuItem("View Logs", on_logs_tail),
         pystray.MenuItem("Restart Server", restart_server),
         pystray.Menu.SEPARATOR,
         pystray.MenuItem("Quit", on_quit)